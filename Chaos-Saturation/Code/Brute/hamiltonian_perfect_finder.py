@@ -14,103 +14,299 @@ This is computationally expensive but your 32-core machine can handle it!
 """
 
 import numpy as np
-from scipy.signal import find_peaks
 from scipy.integrate import odeint
+from scipy.stats import qmc
 import multiprocessing as mp
 from functools import partial
 import json
 from datetime import datetime
 import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from chamber import (CONSTANTS, DEFAULT_CACHE_SIZE, DiskCache, LRUCache,
+                     STAGE_TIMES, STAGES, RatioEvaluator, ResonanceChamber, RunLog,
+                     WorstFirstOrder,
+                     batch_accuracies, branch_and_bound, cached_chamber_accuracies,
+                     iter_batch_accuracies, quantize, ratio_bounds, ratio_key,
+                     split_ratio)
+from chamber.landscape import Landscape
 
 # ============================================================================
-# RESONANCE CHAMBER (Optimized)
+# RESONANCE CHAMBER (shared engine in ../chamber)
 # ============================================================================
 
-class ResonanceChamber:
-    def __init__(self, chamber_size, num_points=12000):  # Slightly reduced for speed
-        self.chamber_size = chamber_size
-        self.num_points = num_points
-        self.x = np.linspace(0, chamber_size, num_points)
-        
-    def generate_wave(self, wavelength):
-        k = 2 * np.pi / wavelength
-        return np.sin(k * self.x)
-    
-    def compute_interference(self, wavelengths):
-        total_field = np.zeros(len(self.x))
-        for wl in wavelengths:
-            if wl > 0:
-                total_field += self.generate_wave(wl)
-        return total_field
-    
-    def extract_ratios(self, field):
-        peaks, _ = find_peaks(np.abs(field), prominence=0.5)
-        if len(peaks) < 2:
-            return []
-        
-        peak_positions = self.x[peaks]
-        ratios = []
-        sample_size = min(150, len(peak_positions))
-        sampled_peaks = peak_positions[::max(1, len(peak_positions)//sample_size)]
-        
-        for i in range(len(sampled_peaks)):
-            for j in range(i+1, min(i+20, len(sampled_peaks))):
-                ratio = sampled_peaks[j] / sampled_peaks[i]
-                if 1.01 < ratio < 3000:
-                    ratios.append(ratio)
-        return ratios
-    
-    def find_best_match(self, ratios, target):
-        if not ratios:
-            return None, float('inf')
-        differences = [abs(r - target) for r in ratios]
-        min_diff = min(differences)
-        best_ratio = ratios[differences.index(min_diff)]
-        return best_ratio, min_diff
-
-# Target constants
-CONSTANTS = {
-    'fine_structure': 137.035999084,
-    'phi': 1.618033988749895,
-    'pi': 3.141592653589793,
-    'e': 2.718281828459045,
-    'proton_electron_mass': 1836.15267343,
-    'weak_mixing_angle': 28.74,
-    'muon_electron_mass': 206.7682830,
-    'sqrt_2': 1.414213562373095,
-    'sqrt_3': 1.732050807568877,
-    'sqrt_5': 2.236067977499790,
-}
+CHAMBER_POINTS = 12000  # Slightly reduced for speed
+PEAK_SAMPLE_LIMIT = 150
+PEAK_WINDOW = 20
+
+CHAMBER_KWARGS = dict(num_points=CHAMBER_POINTS,
+                      sample_limit=PEAK_SAMPLE_LIMIT, window=PEAK_WINDOW)
+
+def make_chamber(L):
+    return ResonanceChamber(L, **CHAMBER_KWARGS)
+
+# Target constants (shared 10-constant set)
+CONSTANT_VALUES = np.array(list(CONSTANTS.values()))
 
 # Simple integer wavelengths (we now know this works!)
 WAVELENGTHS = list(range(1, 31))
 
+# Search box
+L_BOUNDS = (500, 5000)
+S_BOUNDS = (0.05, 0.5)
+PERFECT_THRESHOLD = 99.9999  # 99.9999% = essentially perfect
+ENSEMBLE_STARTS = 7          # Best ensemble endpoints promoted to starting points
+LANDSCAPE_STARTS = 7         # Best landscape candidates promoted to starting points
+
+# Per-process memo in front of the accuracy function. Trajectory points are
+# re-evaluated as gradient centres, and neighbouring grid cells revisit
+# nearly identical (L, s), so keys are quantized to 12 significant digits.
+ACCURACY_CACHE = LRUCache(DEFAULT_CACHE_SIZE)
+
+# Optional persistent store shared across runs and scripts (--disk-cache)
+DISK_CACHE = None
+
+# Set by any pool worker that finds a perfect point; every search loop
+# polls it and winds down (see find_perfect_point)
+CANCEL_EVENT = None
+
+def search_cancelled():
+    return CANCEL_EVENT is not None and CANCEL_EVENT.is_set()
+
+# ============================================================================
+# RUN LOG (append-only JSON lines, see chamber/runlog.py)
+# ============================================================================
+
+# Every evaluated point, trajectory step and phase boundary is appended
+# here as it happens, so --resume can skip finished work and refill the
+# caches after a crash
+RUN_LOG = None
+
+def log_event(event, **fields):
+    if RUN_LOG is not None:
+        RUN_LOG.append(event, **fields)
+
+def log_evaluation(L, s, summary):
+    """Record one evaluated (L, s) point (summary = compute_accuracy_vector tuple)"""
+    log_event('eval', L=L, s=s, accuracies=list(summary[2].values()))
+
+def prefill_caches(records):
+    """Load every logged evaluation into the (L, s) memo and the per-R cache"""
+    count = 0
+    for record in records:
+        if record['event'] != 'eval':
+            continue
+        acc_values = np.array(record['accuracies'], dtype=float)
+        if not len(acc_values):
+            # Older logs recorded a ratio-less point as no accuracies
+            acc_values = np.zeros(len(CONSTANT_VALUES))
+        if 'R' in record:
+            RATIO_EVALUATOR.cache.put(ratio_key(record['R']), acc_values)
+        else:
+            ACCURACY_CACHE.put((quantize(record['L']), quantize(record['s'])),
+                               summarize_accuracy_vector(acc_values))
+        count += 1
+    return count
+
+def resume_state(records):
+    """
+    Per-start progress from a run log
+    Returns: {start index: {'steps': [...], 'phases': {name: record}, 'output': ...}}
+    """
+    state = {}
+    for record in records:
+        if 'start' not in record:
+            continue
+        entry = state.setdefault(record['start'], {'steps': {}, 'phases': {}, 'output': None})
+        if record['event'] == 'step':
+            entry['steps'][record['step']] = record
+        elif record['event'] == 'phase' and record['status'] == 'end':
+            entry['phases'][record['phase']] = record
+        elif record['event'] == 'start_done':
+            entry['output'] = record['output']
+    
+    for entry in state.values():
+        # Only the unbroken run of steps from step 0 can be continued
+        steps = []
+        while len(steps) in entry['steps']:
+            steps.append(entry['steps'][len(steps)])
+        entry['steps'] = steps
+    return state
+
+# ============================================================================
+# INSTRUMENTATION (opt-in, --instrument)
+# ============================================================================
+
+# JSON lines from every process: wall time, evaluations, per-stage time
+# (synthesis / peaks / ratios / matching, see chamber/instrument.py) and
+# cache counters for each phase of each starting point and grid tile
+INSTRUMENT_LOG = None
+
+def set_instrument_log(instrument_log):
+    """Send instrumentation records to instrument_log (a RunLog; None = off)"""
+    global INSTRUMENT_LOG
+    INSTRUMENT_LOG = instrument_log
+    STAGE_TIMES.enabled = instrument_log is not None
+
+def phase_clock():
+    """Wall time, process CPU time and stage counters at the start of a phase"""
+    return time.perf_counter(), time.process_time(), STAGE_TIMES.snapshot()
+
+def record_phase(start, phase, clock, event='phase'):
+    """Append one phase (or grid tile) record, measured from clock"""
+    if INSTRUMENT_LOG is None:
+        return
+    seconds = time.perf_counter() - clock[0]
+    stages = STAGE_TIMES.since(clock[2])
+    evaluations = stages['matching']['calls']
+    INSTRUMENT_LOG.append(event, pid=os.getpid(), start=start, phase=phase,
+                          seconds=seconds, cpu_seconds=time.process_time() - clock[1],
+                          evaluations=evaluations,
+                          evals_per_sec=evaluations / seconds if seconds > 0 else 0.0,
+                          stages=stages, cache=cache_stats())
+
+def summarize_instrumentation(records, wall_seconds, n_processes):
+    """
+    Totals over phase and tile records
+    
+    Phase seconds add up the wall time each search process spent in a
+    phase (grid tiles run inside their parent's grid phase and add
+    evaluations, CPU and stage time only). Stage shares are of the summed
+    stage time; cache counters are the last ones each process reported.
+    """
+    phases = {}
+    stages = {stage: {'seconds': 0.0, 'calls': 0} for stage in STAGES}
+    last_cache = {}
+    for record in records:
+        if record['event'] not in ('phase', 'tile'):
+            continue
+        phase = phases.setdefault(record['phase'], {'seconds': 0.0, 'cpu_seconds': 0.0,
+                                                    'evaluations': 0})
+        if record['event'] == 'phase':
+            phase['seconds'] += record['seconds']
+        phase['cpu_seconds'] += record['cpu_seconds']
+        phase['evaluations'] += record['evaluations']
+        for stage in STAGES:
+            stages[stage]['seconds'] += record['stages'][stage]['seconds']
+            stages[stage]['calls'] += record['stages'][stage]['calls']
+        last_cache[record['pid']] = record['cache']
+    
+    for phase in phases.values():
+        phase['evals_per_sec'] = phase['evaluations'] / phase['seconds'] if phase['seconds'] > 0 else 0.0
+    busy = sum(phase['cpu_seconds'] for phase in phases.values())
+    staged = sum(stage['seconds'] for stage in stages.values())
+    for stage in stages.values():
+        stage['fraction'] = stage['seconds'] / staged if staged > 0 else 0.0
+    
+    cache = {}
+    for stats in last_cache.values():
+        for name, counters in stats.items():
+            totals = cache.setdefault(name, {'hits': 0, 'misses': 0})
+            totals['hits'] += counters['hits']
+            totals['misses'] += counters['misses']
+    for totals in cache.values():
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_ratio'] = totals['hits'] / lookups if lookups else 0.0
+    
+    evaluations = stages['matching']['calls']
+    return {
+        'wall_seconds': wall_seconds,
+        'processes': n_processes,
+        'evaluations': evaluations,
+        'evals_per_sec': evaluations / wall_seconds if wall_seconds > 0 else 0.0,
+        'cpu_seconds': busy,
+        'utilization': busy / (wall_seconds * n_processes) if wall_seconds > 0 else 0.0,
+        'phases': phases,
+        'stages': stages,
+        'cache': cache,
+    }
+
+def print_instrumentation(summary):
+    print("\n" + "="*80)
+    print("INSTRUMENTATION")
+    print("="*80)
+    print(f"Wall time: {summary['wall_seconds']:.1f}s, CPU in phases: {summary['cpu_seconds']:.1f}s "
+          f"({summary['utilization']*100:.0f}% of {summary['processes']} process(es))")
+    print(f"Evaluations: {summary['evaluations']} ({summary['evals_per_sec']:.1f}/s)")
+    print("\nPhases (wall / CPU time summed over processes):")
+    for name, phase in summary['phases'].items():
+        print(f"  {name:12s} {phase['seconds']:9.1f}s {phase['cpu_seconds']:9.1f}s CPU  "
+              f"{phase['evaluations']:8d} evals  {phase['evals_per_sec']:8.1f}/s")
+    print("\nStages (share of evaluation time):")
+    for name, stage in summary['stages'].items():
+        print(f"  {name:12s} {stage['seconds']:9.1f}s  {stage['calls']:8d} calls  "
+              f"{stage['fraction']*100:5.1f}%")
+    print("\nCaches:")
+    for name, totals in summary['cache'].items():
+        print(f"  {name:12s} {totals['hits']} hits, {totals['misses']} misses "
+              f"({totals['hit_ratio']*100:.1f}% hit ratio)")
+
+# ============================================================================
+# ACCURACY EVALUATION
+# ============================================================================
+
 def compute_accuracy_vector(L, s):
     """
-    Compute accuracy for ALL constants at given (L, s)
+    Compute accuracy for ALL constants at given (L, s) (memoized)
     Returns: (avg_accuracy, min_accuracy, accuracies_dict, all_perfect)
     """
+    return ACCURACY_CACHE.get_or_compute((quantize(L), quantize(s)),
+                                         lambda: logged_accuracy_vector(L, s))
+
+def logged_accuracy_vector(L, s):
+    summary = evaluate_accuracy_vector(L, s)
+    log_evaluation(L, s, summary)
+    return summary
+
+def evaluate_accuracy_vector(L, s):
+    """Uncached compute_accuracy_vector"""
+    chamber = make_chamber(L)
+    if DISK_CACHE is not None:
+        return summarize_accuracy_vector(cached_chamber_accuracies(
+            DISK_CACHE, chamber, WAVELENGTHS, CONSTANT_VALUES, scale=s))
+    
     wavelengths = [w * s for w in WAVELENGTHS]
+    ratios = chamber.compute_ratios(wavelengths)
+    
+    # No ratios -> all-zero accuracies, as in the batched and cached paths
+    return summarize_accuracy_vector(chamber.compute_accuracies(ratios, CONSTANT_VALUES))
+
+def compute_accuracy_vectors(L_values, s_values):
+    """
+    compute_accuracy_vector for several points at once
     
-    chamber = ResonanceChamber(L)
-    field = chamber.compute_interference(wavelengths)
-    ratios = chamber.extract_ratios(field)
+    Cached points are looked up; the rest share one batched synthesis pass
+    on the common unit grid (see chamber/batch.py) and are cached.
+    """
+    keys = [(quantize(L), quantize(s)) for L, s in zip(L_values, s_values)]
+    results = [ACCURACY_CACHE.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
     
-    if not ratios:
-        return 0.0, 0.0, {}, False
+    if missing:
+        acc_matrix = batch_accuracies(WAVELENGTHS, CONSTANT_VALUES,
+                                      L=np.asarray(L_values, dtype=float)[missing],
+                                      s=np.asarray(s_values, dtype=float)[missing],
+                                      disk_cache=DISK_CACHE, **CHAMBER_KWARGS)
+        for i, acc_values in zip(missing, acc_matrix):
+            results[i] = summarize_accuracy_vector(acc_values)
+            ACCURACY_CACHE.put(keys[i], results[i])
+            log_evaluation(L_values[i], s_values[i], results[i])
     
-    accuracies = {}
-    for name, target in CONSTANTS.items():
-        match, error = chamber.find_best_match(ratios, target)
-        if match is not None:
-            acc = 100 * (1 - error / target)
-            accuracies[name] = acc
-        else:
-            accuracies[name] = 0.0
+    return results
+
+def summarize_accuracy_vector(acc_values):
+    """
+    Per-constant accuracy array -> compute_accuracy_vector's return tuple
+    Returns: (avg_accuracy, min_accuracy, accuracies_dict, all_perfect)
+    """
+    accuracies = dict(zip(CONSTANTS.keys(), acc_values.tolist()))
     
     avg_acc = np.mean(list(accuracies.values()))
     min_acc = np.min(list(accuracies.values()))
-    all_perfect = all(a >= 99.9999 for a in accuracies.values())  # 99.9999% = essentially perfect
+    all_perfect = all(a >= PERFECT_THRESHOLD for a in accuracies.values())
     
     return avg_acc, min_acc, accuracies, all_perfect
 
@@ -118,26 +314,39 @@ def compute_accuracy_vector(L, s):
 # HAMILTONIAN DYNAMICS
 # ============================================================================
 
-def compute_gradient(L, s, h=0.1):
+def compute_gradients(L_values, s_values, h=0.1):
     """
-    Compute gradient of average accuracy w.r.t. (L, s)
-    Using finite differences
+    compute_gradient for N points: every centre and stencil point is
+    evaluated in one batched call
+    Returns: (N x 2 gradients, list of N centre compute_accuracy_vector tuples)
     """
-    # Center point
-    acc_center, _, _, _ = compute_accuracy_vector(L, s)
+    L_values = np.asarray(L_values, dtype=float)
+    s_values = np.asarray(s_values, dtype=float)
+    h_s = h * 0.001  # Smaller step for s
     
-    # Gradients
-    acc_L_plus, _, _, _ = compute_accuracy_vector(L + h, s)
-    acc_L_minus, _, _, _ = compute_accuracy_vector(L - h, s)
-    acc_s_plus, _, _, _ = compute_accuracy_vector(L, s + h*0.001)  # Smaller step for s
-    acc_s_minus, _, _, _ = compute_accuracy_vector(L, s - h*0.001)
+    # Stencil rows: centre, L+h, L-h, s+h_s, s-h_s
+    L_stencil = np.stack([L_values, L_values + h, L_values - h, L_values, L_values])
+    s_stencil = np.stack([s_values, s_values, s_values, s_values + h_s, s_values - h_s])
+    results = compute_accuracy_vectors(L_stencil.ravel(), s_stencil.ravel())
     
-    grad_L = (acc_L_plus - acc_L_minus) / (2 * h)
-    grad_s = (acc_s_plus - acc_s_minus) / (2 * h * 0.001)
+    n = len(L_values)
+    avg = np.array([result[0] for result in results]).reshape(5, n)
+    grads = np.column_stack([(avg[1] - avg[2]) / (2 * h),
+                             (avg[3] - avg[4]) / (2 * h_s)])
     
-    return np.array([grad_L, grad_s])
+    return grads, results[:n]
+
+def compute_gradient(L, s, h=0.1):
+    """
+    Compute gradient of average accuracy w.r.t. (L, s)
+    Using finite differences; the centre and the four stencil points are
+    evaluated in one batched call
+    Returns: (gradient, centre compute_accuracy_vector tuple)
+    """
+    grads, centers = compute_gradients([L], [s], h)
+    return grads[0], centers[0]
 
-def hamiltonian_step(state, dt=0.1, friction=0.1):
+def hamiltonian_step(state, dt=0.1, friction=0.1, grad=None):
     """
     One step of Hamiltonian dynamics
     
@@ -146,12 +355,15 @@ def hamiltonian_step(state, dt=0.1, friction=0.1):
     Hamiltonian: H = K(p) + V(L,s)
     where V = -accuracy (we want to maximize accuracy = minimize -accuracy)
     
+    grad: precomputed gradient at (L, s), if the caller already has it
+    
     Returns: new_state
     """
     L, s, p_L, p_s = state
     
     # Compute force (negative gradient of potential)
-    grad = compute_gradient(L, s)
+    if grad is None:
+        grad, _ = compute_gradient(L, s)
     force_L, force_s = grad  # Positive gradient means go uphill (maximize accuracy)
     
     # Update momenta (with friction)
@@ -163,24 +375,36 @@ def hamiltonian_step(state, dt=0.1, friction=0.1):
     s_new = s + p_s_new * dt
     
     # Bounds
-    L_new = np.clip(L_new, 500, 5000)
-    s_new = np.clip(s_new, 0.05, 0.5)
+    L_new = np.clip(L_new, *L_BOUNDS)
+    s_new = np.clip(s_new, *S_BOUNDS)
     
     return np.array([L_new, s_new, p_L_new, p_s_new])
 
-def hamiltonian_trajectory(L_start, s_start, n_steps=50, dt=0.1):
+def hamiltonian_trajectory(L_start, s_start, n_steps=50, dt=0.1, start=None,
+                           resume_steps=()):
     """
     Follow Hamiltonian trajectory from starting point
+    
+    Every step is logged under starting point `start`; resume_steps (the
+    logged steps of an earlier run) are restored instead of recomputed.
+    
     Returns: list of (L, s, accuracy) tuples
     """
     print(f"  Starting Hamiltonian trajectory from L={L_start:.1f}, s={s_start:.3f}")
     
     state = np.array([L_start, s_start, 0.0, 0.0])  # Start with zero momentum
-    trajectory = []
+    trajectory = [record['point'] for record in resume_steps]
+    if resume_steps:
+        print(f"    Resuming after {len(resume_steps)} logged steps")
+        if resume_steps[-1]['next_state'] is None:
+            return trajectory
+        state = np.array(resume_steps[-1]['next_state'])
     
-    for step in range(n_steps):
+    for step in range(len(resume_steps), n_steps):
+        if search_cancelled():
+            break
         L, s = state[0], state[1]
-        avg_acc, min_acc, accs, perfect = compute_accuracy_vector(L, s)
+        grad, (avg_acc, min_acc, accs, perfect) = compute_gradient(L, s)
         
         trajectory.append({
             'L': L,
@@ -192,6 +416,7 @@ def hamiltonian_trajectory(L_start, s_start, n_steps=50, dt=0.1):
         })
         
         if perfect:
+            log_event('step', start=start, step=step, point=trajectory[-1], next_state=None)
             print(f"    ★ PERFECT POINT FOUND at L={L:.3f}, s={s:.4f}!")
             break
         
@@ -199,17 +424,268 @@ def hamiltonian_trajectory(L_start, s_start, n_steps=50, dt=0.1):
             print(f"    Step {step}: L={L:.1f}, s={s:.3f}, avg={avg_acc:.4f}%, min={min_acc:.4f}%")
         
         # Take Hamiltonian step
-        state = hamiltonian_step(state, dt=dt)
+        state = hamiltonian_step(state, dt=dt, grad=grad)
+        log_event('step', start=start, step=step, point=trajectory[-1], next_state=state)
     
     return trajectory
 
+# ============================================================================
+# HAMILTONIAN ENSEMBLE
+# ============================================================================
+
+def latin_hypercube_starts(n, seed=None):
+    """n (L, s) seeds stratified over the search box (n x 2 array)"""
+    sampler = qmc.LatinHypercube(d=2, seed=seed)
+    return qmc.scale(sampler.random(n), [L_BOUNDS[0], S_BOUNDS[0]],
+                     [L_BOUNDS[1], S_BOUNDS[1]])
+
+def ensemble_step(states, grads, dt=0.1, friction=0.1):
+    """
+    hamiltonian_step for N states at once
+    
+    states: N x 4 array of [L, s, p_L, p_s]; grads: N x 2
+    dt, friction: scalars or length-N arrays (per member)
+    
+    Returns: new N x 4 states
+    """
+    dt = np.asarray(dt, dtype=float)[..., None]
+    friction = np.asarray(friction, dtype=float)[..., None]
+    
+    momenta = (1 - friction) * states[:, 2:] + grads * dt
+    positions = states[:, :2] + momenta * dt
+    positions[:, 0] = np.clip(positions[:, 0], *L_BOUNDS)
+    positions[:, 1] = np.clip(positions[:, 1], *S_BOUNDS)
+    
+    return np.column_stack([positions, momenta])
+
+def hamiltonian_ensemble(starts, n_steps=50, dt=0.1, friction=0.1):
+    """
+    Follow N Hamiltonian trajectories together
+    
+    starts: N x 2 array of (L, s); dt, friction: scalars or length-N arrays.
+    All active members' gradients go through one batched accuracy call per
+    step. A member stops at its first perfect point.
+    
+    Returns: list of N trajectories (lists of dicts like hamiltonian_trajectory)
+    """
+    starts = np.asarray(starts, dtype=float)
+    n = len(starts)
+    dt = np.broadcast_to(np.asarray(dt, dtype=float), (n,))
+    friction = np.broadcast_to(np.asarray(friction, dtype=float), (n,))
+    print(f"  Hamiltonian ensemble: {n} members, {n_steps} steps")
+    
+    states = np.column_stack([starts, np.zeros((n, 2))])  # Zero initial momentum
+    trajectories = [[] for _ in range(n)]
+    active = np.ones(n, dtype=bool)
+    
+    for step in range(n_steps):
+        if search_cancelled() or not active.any():
+            break
+        members = np.flatnonzero(active)
+        grads, centers = compute_gradients(states[members, 0], states[members, 1])
+        
+        for member, (avg_acc, min_acc, accs, perfect) in zip(members, centers):
+            trajectories[member].append({
+                'L': states[member, 0],
+                's': states[member, 1],
+                'avg_accuracy': avg_acc,
+                'min_accuracy': min_acc,
+                'accuracies': accs,
+                'all_perfect': perfect
+            })
+            if perfect:
+                print(f"    ★ PERFECT POINT FOUND at L={states[member, 0]:.3f}, s={states[member, 1]:.4f}!")
+                active[member] = False
+        
+        if step % 10 == 0:
+            best_min = max(center[1] for center in centers)
+            print(f"    Step {step}: {len(members)} active, best min={best_min:.4f}%")
+        
+        states[members] = ensemble_step(states[members], grads,
+                                        dt[members], friction[members])
+    
+    return trajectories
+
 # ============================================================================
 # BRUTE FORCE GRID SEARCH
 # ============================================================================
 
-def grid_search_local(L_center, s_center, L_range=50, s_range=0.02, L_steps=21, s_steps=21):
+# Tiles per worker: several per worker keeps every core busy when tiles
+# finish unevenly (early exits, cache hits)
+TILES_PER_WORKER = 4
+
+# Shared with grid pool workers (see init_grid_worker)
+GRID_BEST_MIN = None   # mp.Value: best min_accuracy found by any tile
+GRID_STOP = None       # mp.Event: set when any tile finds a perfect point
+
+# Grid points are screened against the best min_accuracy so far, matching
+# the constants that most often decided past rejections first
+SCREEN_ORDER = WorstFirstOrder(len(CONSTANT_VALUES))
+
+def grid_stopped():
+    return search_cancelled() or (GRID_STOP is not None and GRID_STOP.is_set())
+
+def publish_grid_best(min_acc):
+    """Raise the shared best-so-far min_accuracy (no-op outside grid workers)"""
+    if GRID_BEST_MIN is None:
+        return
+    with GRID_BEST_MIN.get_lock():
+        if min_acc > GRID_BEST_MIN.value:
+            GRID_BEST_MIN.value = min_acc
+
+def grid_threshold(best_min):
+    """Screening threshold: best min_accuracy in this scan or any other tile"""
+    if GRID_BEST_MIN is None:
+        return best_min
+    return max(best_min, GRID_BEST_MIN.value)
+
+def scan_grid_points(L_flat, s_flat, verbose=True):
+    """
+    Evaluate (L, s) points in order, in batched chunks
+    
+    Points already in ACCURACY_CACHE (e.g. prefilled on --resume) are
+    looked up; the rest are batched and stored. They are screened
+    (chamber/screening.py): matching stops at the first constant below the
+    best min_accuracy so far, since such a point can neither be perfect
+    nor the new best. Screened-out points are logged but not cached.
+    
+    Returns: (index, summary) of the first perfect point, else of the first
+             point with the highest min_accuracy (index None if none > 0)
+    """
+    best_index, best = None, (0, 0, {}, False)
+    total = len(L_flat)
+    screened = 0
+    
+    keys = [(quantize(L), quantize(s)) for L, s in zip(L_flat, s_flat)]
+    cached = [ACCURACY_CACHE.get(key) for key in keys]
+    missing = np.array([i for i, summary in enumerate(cached) if summary is None], dtype=int)
+    
+    def visit(i, summary):
+        """Track the best point; True if i is perfect"""
+        nonlocal best_index, best
+        if summary[3]:
+            best_index, best = i, summary
+            return True
+        # Track best by minimum accuracy (want all constants high)
+        if summary[1] > best[1]:
+            best_index, best = i, summary
+        return False
+    
+    next_index = 0   # Cached points before next_index have been visited
+    for start, acc_block in iter_batch_accuracies(WAVELENGTHS, CONSTANT_VALUES,
+                                                  L=L_flat[missing], s=s_flat[missing],
+                                                  disk_cache=DISK_CACHE,
+                                                  threshold=lambda: grid_threshold(best[1]),
+                                                  order=SCREEN_ORDER,
+                                                  **CHAMBER_KWARGS):
+        for row, acc_values in enumerate(acc_block, start):
+            i = missing[row]
+            for j in range(next_index, i):
+                if visit(j, cached[j]):
+                    return j, best
+            next_index = i + 1
+            
+            if np.isnan(acc_values).any():
+                screened += 1
+                log_event('screened', L=L_flat[i], s=s_flat[i])
+                continue
+            summary = summarize_accuracy_vector(acc_values)
+            ACCURACY_CACHE.put(keys[i], summary)
+            log_evaluation(L_flat[i], s_flat[i], summary)
+            if visit(i, summary):
+                return i, best
+        
+        publish_grid_best(best[1])
+        if verbose:
+            count = next_index
+            print(f"    Progress: {count}/{total} ({100*count/total:.1f}%), "
+                  f"{screened} screened out")
+        if grid_stopped():
+            if verbose:
+                print("    Cancelled: a perfect point was found elsewhere")
+            return best_index, best
+    
+    # Cached points after the last batched one
+    for j in range(next_index, total):
+        if visit(j, cached[j]):
+            return j, best
+    publish_grid_best(best[1])
+    
+    return best_index, best
+
+def grid_tile_size(total, n_workers):
+    """Points per tile so each worker gets about TILES_PER_WORKER tiles"""
+    return max(1, -(-total // (n_workers * TILES_PER_WORKER)))
+
+def init_grid_worker(best_min, stop_event, chamber_kwargs, cache_size, disk_cache,
+                     run_log=None, instrument_log=None):
+    """Pool initializer: shared best/stop state plus the parent's chamber settings"""
+    global GRID_BEST_MIN, GRID_STOP, RUN_LOG
+    GRID_BEST_MIN, GRID_STOP, RUN_LOG = best_min, stop_event, run_log
+    set_instrument_log(instrument_log)
+    configure_chamber(cache_size=cache_size, disk_cache=disk_cache, **chamber_kwargs)
+
+def grid_tile(task):
+    """
+    Scan one tile (start, L_tile, s_tile)
+    Returns: (start, n_points, global index or None, summary or None)
+    """
+    start, L_tile, s_tile = task
+    if grid_stopped():
+        return start, len(L_tile), None, None
+    clock = phase_clock()
+    index, summary = scan_grid_points(L_tile, s_tile, verbose=False)
+    record_phase(None, 'grid', clock, event='tile')
+    if summary[3]:
+        GRID_STOP.set()
+    return start, len(L_tile), None if index is None else start + index, summary
+
+def scan_grid_tiles(L_flat, s_flat, n_workers):
+    """
+    scan_grid_points over tiles on a process pool
+    
+    Workers share the best min_accuracy so far and a stop flag; the first
+    perfect point stops every tile. Returns the same (index, summary) as
+    the serial scan (lowest index wins among perfect points and ties).
+    """
+    total = len(L_flat)
+    tile = grid_tile_size(total, n_workers)
+    tasks = [(i, L_flat[i:i + tile], s_flat[i:i + tile]) for i in range(0, total, tile)]
+    print(f"    {len(tasks)} tiles of {tile} points on {n_workers} workers")
+    
+    best_min = mp.Value('d', 0.0)
+    stop_event = mp.Event()
+    outputs = []
+    count = 0
+    with mp.Pool(processes=n_workers, initializer=init_grid_worker,
+                 initargs=(best_min, stop_event, dict(CHAMBER_KWARGS),
+                           ACCURACY_CACHE.maxsize, DISK_CACHE, RUN_LOG,
+                           INSTRUMENT_LOG)) as pool:
+        for start, n_points, index, summary in pool.imap_unordered(grid_tile, tasks):
+            count += n_points
+            outputs.append((start, index, summary))
+            if summary is not None and summary[3]:
+                stop_event.set()
+            print(f"    Progress: {count}/{total} ({100*count/total:.1f}%), "
+                  f"best min so far {best_min.value:.4f}%")
+    
+    outputs.sort(key=lambda output: output[0])
+    perfect = [(index, summary) for _, index, summary in outputs
+               if summary is not None and summary[3]]
+    if perfect:
+        return min(perfect, key=lambda item: item[0])
+    
+    best_index, best = None, (0, 0, {}, False)
+    for _, index, summary in outputs:
+        if index is not None and summary[1] > best[1]:
+            best_index, best = index, summary
+    return best_index, best
+
+def grid_search_local(L_center, s_center, L_range=50, s_range=0.02, L_steps=21, s_steps=21,
+                      n_workers=1):
     """
     Fine grid search around a promising point
+    (n_workers > 1 scans tiles of the grid on a process pool)
     """
     print(f"  Grid searching around L={L_center:.1f}, s={s_center:.3f}")
     print(f"    L range: [{L_center-L_range:.1f}, {L_center+L_range:.1f}]")
@@ -218,88 +694,319 @@ def grid_search_local(L_center, s_center, L_range=50, s_range=0.02, L_steps=21,
     L_vals = np.linspace(L_center - L_range, L_center + L_range, L_steps)
     s_vals = np.linspace(s_center - s_range, s_center + s_range, s_steps)
     
+    # Same visiting order as the nested L/s loops, evaluated in batched chunks
+    L_grid, s_grid = np.meshgrid(L_vals, s_vals, indexing='ij')
+    L_flat, s_flat = L_grid.ravel(), s_grid.ravel()
+    
+    if n_workers > 1 and len(L_flat) > 1:
+        index, (avg_acc, min_acc, accs, perfect) = scan_grid_tiles(L_flat, s_flat, n_workers)
+    else:
+        index, (avg_acc, min_acc, accs, perfect) = scan_grid_points(L_flat, s_flat)
+    
+    if index is None:
+        best_L, best_s = L_center, s_center
+    else:
+        best_L, best_s = L_flat[index], s_flat[index]
+    
+    if perfect:
+        print(f"    ★ PERFECT POINT: L={best_L:.3f}, s={best_s:.4f}")
+        return best_L, best_s, avg_acc, min_acc, accs, True
+    
+    print(f"    Best found: L={best_L:.3f}, s={best_s:.4f}, avg={avg_acc:.4f}%, min={min_acc:.4f}%")
+    
+    return best_L, best_s, avg_acc, min_acc, accs, False
+
+# ============================================================================
+# L/s INVARIANT MODE (1-D search over R = L/s)
+# ============================================================================
+
+# Every accuracy depends only on R = L/s (see chamber/invariant.py), so this
+# mode searches R directly and caches each evaluation by R. Reported (L, s)
+# pairs are representatives of the R line, chosen near the starting s.
+
+R_BOUNDS = ratio_bounds(L_BOUNDS, S_BOUNDS)
+
+RATIO_EVALUATOR = RatioEvaluator(WAVELENGTHS, CONSTANT_VALUES, **CHAMBER_KWARGS)
+
+def configure_chamber(cache_size=None, disk_cache=None, **overrides):
+    """Update chamber settings (e.g. peak_method) for every evaluation path"""
+    global ACCURACY_CACHE, DISK_CACHE, RATIO_EVALUATOR
+    CHAMBER_KWARGS.update(overrides)
+    if cache_size is None:
+        cache_size = ACCURACY_CACHE.maxsize
+    if disk_cache is not None:
+        DISK_CACHE = disk_cache
+    ACCURACY_CACHE = LRUCache(cache_size)
+    RATIO_EVALUATOR = RatioEvaluator(WAVELENGTHS, CONSTANT_VALUES,
+                                     cache_size=cache_size, disk_cache=DISK_CACHE,
+                                     **CHAMBER_KWARGS)
+
+def cache_stats():
+    """Hit/miss counters of the (L, s) memo, the per-R cache and the disk cache"""
+    stats = {'accuracy': ACCURACY_CACHE.stats(), 'ratio': RATIO_EVALUATOR.cache.stats()}
+    if DISK_CACHE is not None:
+        stats['disk'] = DISK_CACHE.stats()
+    return stats
+
+def compute_accuracy_vector_R(R):
+    """
+    Compute accuracy for ALL constants on the line L/s = R
+    Returns: (avg_accuracy, min_accuracy, accuracies_dict, all_perfect)
+    """
+    new = ratio_key(R) not in RATIO_EVALUATOR.cache
+    acc_values = RATIO_EVALUATOR.accuracies(R)
+    if new:
+        log_event('eval', R=R, accuracies=acc_values)
+    return summarize_accuracy_vector(acc_values)
+
+def compute_gradient_R(R, h=0.3):
+    """
+    d(average accuracy)/dR by central differences
+    (h=0.3 matches the L-step of 0.1 at s ~ 0.33)
+    """
+    acc_plus, _, _, _ = compute_accuracy_vector_R(R + h)
+    acc_minus, _, _, _ = compute_accuracy_vector_R(R - h)
+    return (acc_plus - acc_minus) / (2 * h)
+
+def hamiltonian_trajectory_R(R_start, s_ref, n_steps=50, dt=0.1, friction=0.1,
+                             start=None, resume_steps=()):
+    """
+    Hamiltonian trajectory in the single coordinate R
+    (steps are logged and resumed like hamiltonian_trajectory)
+    Returns: list of dicts like hamiltonian_trajectory (plus 'R')
+    """
+    print(f"  Starting R-trajectory from R={R_start:.2f}")
+    
+    R, p_R = float(np.clip(R_start, *R_BOUNDS)), 0.0
+    trajectory = [record['point'] for record in resume_steps]
+    if resume_steps:
+        print(f"    Resuming after {len(resume_steps)} logged steps")
+        if resume_steps[-1]['next_state'] is None:
+            return trajectory
+        R, p_R = resume_steps[-1]['next_state']
+    
+    for step in range(len(resume_steps), n_steps):
+        if search_cancelled():
+            break
+        avg_acc, min_acc, accs, perfect = compute_accuracy_vector_R(R)
+        L, s = split_ratio(R, L_BOUNDS, S_BOUNDS, s_ref)
+        
+        trajectory.append({
+            'R': R,
+            'L': L,
+            's': s,
+            'avg_accuracy': avg_acc,
+            'min_accuracy': min_acc,
+            'accuracies': accs,
+            'all_perfect': perfect
+        })
+        
+        if perfect:
+            log_event('step', start=start, step=step, point=trajectory[-1], next_state=None)
+            print(f"    ★ PERFECT POINT FOUND at R={R:.4f} (L={L:.3f}, s={s:.4f})!")
+            break
+        
+        if step % 10 == 0:
+            print(f"    Step {step}: R={R:.2f}, avg={avg_acc:.4f}%, min={min_acc:.4f}%")
+        
+        p_R = (1 - friction) * p_R + compute_gradient_R(R) * dt
+        R = float(np.clip(R + p_R * dt, *R_BOUNDS))
+        log_event('step', start=start, step=step, point=trajectory[-1], next_state=[R, p_R])
+    
+    return trajectory
+
+def grid_search_local_R(R_min, R_max, R_steps=101, s_ref=None):
+    """
+    1-D scan of R over [R_min, R_max]
+    Returns the same tuple as grid_search_local
+    """
+    R_min, R_max = max(R_min, R_BOUNDS[0]), min(R_max, R_BOUNDS[1])
+    print(f"  R scan over [{R_min:.2f}, {R_max:.2f}] ({R_steps} points)")
+    
     best_avg = 0
     best_min = 0
-    best_L = L_center
-    best_s = s_center
+    best_R = 0.5 * (R_min + R_max)
     best_accs = {}
-    perfect_found = False
-    
-    total = len(L_vals) * len(s_vals)
-    count = 0
     
-    for L in L_vals:
-        for s in s_vals:
-            count += 1
-            if count % 50 == 0:
-                print(f"    Progress: {count}/{total} ({100*count/total:.1f}%)")
-            
-            avg_acc, min_acc, accs, perfect = compute_accuracy_vector(L, s)
-            
-            if perfect:
-                print(f"    ★ PERFECT POINT: L={L:.3f}, s={s:.4f}")
-                return L, s, avg_acc, min_acc, accs, True
-            
-            # Track best by minimum accuracy (want all constants high)
-            if min_acc > best_min:
-                best_min = min_acc
-                best_avg = avg_acc
-                best_L = L
-                best_s = s
-                best_accs = accs
+    for R in np.linspace(R_min, R_max, R_steps):
+        if search_cancelled():
+            break
+        avg_acc, min_acc, accs, perfect = compute_accuracy_vector_R(R)
+        
+        if perfect:
+            L, s = split_ratio(R, L_BOUNDS, S_BOUNDS, s_ref)
+            print(f"    ★ PERFECT POINT: R={R:.4f} (L={L:.3f}, s={s:.4f})")
+            return L, s, avg_acc, min_acc, accs, True
+        
+        if min_acc > best_min:
+            best_min = min_acc
+            best_avg = avg_acc
+            best_R = R
+            best_accs = accs
     
-    print(f"    Best found: L={best_L:.3f}, s={best_s:.4f}, avg={best_avg:.4f}%, min={best_min:.4f}%")
+    best_L, best_s = split_ratio(best_R, L_BOUNDS, S_BOUNDS, s_ref)
+    print(f"    Best found: R={best_R:.4f} (L={best_L:.3f}, s={best_s:.4f}), avg={best_avg:.4f}%, min={best_min:.4f}%")
+    print(f"    Distinct R evaluations cached: {len(RATIO_EVALUATOR.cache)}")
     
-    return best_L, best_s, best_avg, best_min, best_accs, perfect_found
+    return best_L, best_s, best_avg, best_min, best_accs, False
 
 # ============================================================================
-# MULTI-START STRATEGY
+# BRANCH AND BOUND (exhaustive over the whole box, analytic peaks)
 # ============================================================================
 
-def find_perfect_point(starting_points, use_hamiltonian=True, use_grid=True):
+def branch_and_bound_search(threshold=None, min_width=1e-3):
     """
-    Multi-strategy search for perfect 100% point
+    Prove which R = L/s in R_BOUNDS can reach threshold on every constant
     
-    Strategy:
-    1. Start from multiple known good points
-    2. Use Hamiltonian dynamics to explore landscape
-    3. Do fine grid search around promising regions
-    4. Look for the perfect configuration
+    Cells of R are bounded from above (chamber/pruning.py) and discarded
+    when any constant provably misses threshold; cells proven to reach it
+    are certified whole, the rest are bisected down to min_width. Every
+    surviving interval is evaluated at its midpoint.
+    Covers the whole (L, s) box, for exact (analytic) peaks.
+    
+    Returns: (summary dict, perfect_points)
     """
+    if threshold is None:
+        threshold = PERFECT_THRESHOLD
     
     print("="*80)
-    print("SEARCHING FOR PERFECT 100% CONFIGURATION")
+    print("BRANCH AND BOUND OVER R = L/s")
     print("="*80)
-    print(f"Start time: {datetime.now().strftime('%H:%M:%S')}")
-    print(f"Starting points: {len(starting_points)}")
-    print(f"Strategies: Hamiltonian={'YES' if use_hamiltonian else 'NO'}, Grid={'YES' if use_grid else 'NO'}")
-    print()
+    print(f"R range: [{R_BOUNDS[0]:.1f}, {R_BOUNDS[1]:.1f}], threshold {threshold}%")
+    
+    start_time = datetime.now()
+    result = branch_and_bound(WAVELENGTHS, CONSTANT_VALUES, R_BOUNDS, threshold,
+                              prominence=CHAMBER_KWARGS.get('prominence', 0.5),
+                              sample_limit=PEAK_SAMPLE_LIMIT, window=PEAK_WINDOW,
+                              min_width=min_width)
+    elapsed = (datetime.now() - start_time).total_seconds()
+    
+    total_width = R_BOUNDS[1] - R_BOUNDS[0]
+    print(f"  Cells bounded: {result['cells']}, pruned: {result['pruned']} "
+          f"({100*result['pruned_width']/total_width:.4f}% of the R range) in {elapsed:.1f}s")
+    print(f"  Surviving intervals: {len(result['survivors'])}")
     
-    all_results = []
+    evaluator = RatioEvaluator(WAVELENGTHS, CONSTANT_VALUES,
+                               **dict(CHAMBER_KWARGS, peak_method='analytic'))
     perfect_points = []
+    intervals = []
+    for a, b, bound, certified in result['survivors']:
+        R = 0.5 * (a + b)
+        avg_acc, min_acc, accs, perfect = summarize_accuracy_vector(evaluator.accuracies(R))
+        L, s = split_ratio(R, L_BOUNDS, S_BOUNDS)
+        intervals.append({'R_min': a, 'R_max': b, 'bound': bound, 'certified': certified,
+                          'min_accuracy': min_acc, 'avg_accuracy': avg_acc})
+        if min_acc >= threshold:
+            print(f"    ★ R={R:.4f} (L={L:.3f}, s={s:.4f}): min={min_acc:.6f}%")
+            perfect_points.append((L, s, avg_acc, accs))
     
-    for i, (L_start, s_start) in enumerate(starting_points):
-        print(f"\n{'='*80}")
-        print(f"STARTING POINT {i+1}/{len(starting_points)}: L={L_start}, s={s_start}")
-        print(f"{'='*80}")
-        
-        # Initial evaluation
+    if not result['survivors']:
+        print(f"  No R in range can reach {threshold}% on every constant")
+    
+    summary = {'threshold': threshold, 'cells': result['cells'],
+               'pruned': result['pruned'], 'pruned_width': result['pruned_width'],
+               'seconds': elapsed, 'survivors': intervals}
+    return summary, perfect_points
+
+# ============================================================================
+# PRECOMPUTED LANDSCAPE (python -m chamber.landscape build ...)
+# ============================================================================
+
+def landscape_starts(landscape, n=LANDSCAPE_STARTS):
+    """
+    Best candidates of a precomputed landscape, re-evaluated exactly
+    Returns: list of (L, s, min_accuracy) with L/s = R inside the box
+    """
+    if (landscape.meta['wavelengths'] != [float(w) for w in WAVELENGTHS]
+            or not np.array_equal(landscape.targets, CONSTANT_VALUES)):
+        raise ValueError(f"{landscape.path} was built for other wavelengths or constants")
+    
+    starts = []
+    for R, table_min in landscape.candidates(n, R_BOUNDS):
+        avg_acc, min_acc, accs, perfect = compute_accuracy_vector_R(R)
+        L, s = split_ratio(R, L_BOUNDS, S_BOUNDS)
+        print(f"  Landscape start: R={R:.4f} (L={L:.3f}, s={s:.4f}), "
+              f"table min={table_min:.4f}%, exact min={min_acc:.4f}%")
+        starts.append((L, s, min_acc))
+    return starts
+
+# ============================================================================
+# MULTI-START STRATEGY
+# ============================================================================
+
+def search_from_start(task, n_starts=None, use_hamiltonian=True, use_grid=True,
+                      ratio_mode=False, grid_workers=1):
+    """
+    Trajectory + grid refinement from one (index, (L, s), resume) task (one pool task)
+    
+    resume is this start's entry of resume_state() (or None): a logged
+    output is returned as is, and logged steps and finished phases are
+    restored instead of recomputed.
+    
+    Returns: {'index', 'result' (all_results entry or None),
+              'perfect_points', 'cancelled', 'cache'}
+    """
+    index, (L_start, s_start), resume = task
+    if resume is None:
+        resume = {'steps': [], 'phases': {}, 'output': None}
+    if resume['output'] is not None:
+        print(f"\nStarting point {index+1}/{n_starts} already finished (run log)")
+        return dict(resume['output'], cache={'hits': 0, 'misses': 0})
+    
+    output = {'index': index, 'result': None, 'perfect_points': [],
+              'cancelled': False}
+    if search_cancelled():
+        output['cancelled'] = True
+        return output
+    
+    cache = RATIO_EVALUATOR.cache if ratio_mode else ACCURACY_CACHE
+    hits_before, misses_before = cache.hits, cache.misses
+    perfect_points = output['perfect_points']
+    
+    print(f"\n{'='*80}")
+    print(f"STARTING POINT {index+1}/{n_starts}: L={L_start}, s={s_start}")
+    print(f"{'='*80}")
+    
+    # Initial evaluation
+    clock = phase_clock()
+    if ratio_mode:
+        avg_acc, min_acc, accs, perfect = compute_accuracy_vector_R(L_start / s_start)
+    else:
         avg_acc, min_acc, accs, perfect = compute_accuracy_vector(L_start, s_start)
-        print(f"Initial: avg={avg_acc:.4f}%, min={min_acc:.4f}%")
-        
-        if perfect:
-            print("★ ALREADY PERFECT!")
-            perfect_points.append((L_start, s_start, avg_acc, accs))
-            continue
-        
-        # Hamiltonian exploration
-        if use_hamiltonian:
-            print("\nPhase 1: Hamiltonian trajectory...")
-            trajectory = hamiltonian_trajectory(L_start, s_start, n_steps=30, dt=0.5)
+    record_phase(index, 'initial', clock)
+    print(f"Initial: avg={avg_acc:.4f}%, min={min_acc:.4f}%")
+    
+    if perfect:
+        print("★ ALREADY PERFECT!")
+        perfect_points.append((L_start, s_start, avg_acc, accs))
+    
+    L_best, s_best = L_start, s_start
+    
+    # Hamiltonian exploration
+    if not perfect_points and use_hamiltonian:
+        print("\nPhase 1: Hamiltonian trajectory...")
+        clock = phase_clock()
+        if 'hamiltonian' in resume['phases']:
+            print("  Finished in the run log")
+            best_traj = resume['phases']['hamiltonian']['best']
+        else:
+            log_event('phase', start=index, phase='hamiltonian', status='begin')
+            if ratio_mode:
+                trajectory = hamiltonian_trajectory_R(L_start / s_start, s_start,
+                                                      n_steps=30, dt=0.5, start=index,
+                                                      resume_steps=resume['steps'])
+            else:
+                trajectory = hamiltonian_trajectory(L_start, s_start, n_steps=30, dt=0.5,
+                                                    start=index, resume_steps=resume['steps'])
             
             # Find best point along trajectory
-            best_traj = max(trajectory, key=lambda x: x['min_accuracy'])
-            
+            best_traj = max(trajectory, key=lambda x: x['min_accuracy']) if trajectory else None
+            if not search_cancelled():
+                log_event('phase', start=index, phase='hamiltonian', status='end',
+                          best=best_traj)
+        record_phase(index, 'hamiltonian', clock)
+        
+        if best_traj is not None:
             if best_traj['all_perfect']:
                 print("★ PERFECT FOUND IN TRAJECTORY!")
                 perfect_points.append((
@@ -308,38 +1015,149 @@ def find_perfect_point(starting_points, use_hamiltonian=True, use_grid=True):
                     best_traj['avg_accuracy'],
                     best_traj['accuracies']
                 ))
-                continue
             
             L_best, s_best = best_traj['L'], best_traj['s']
             print(f"Best trajectory point: L={L_best:.3f}, s={s_best:.4f}, min={best_traj['min_accuracy']:.4f}%")
+    
+    # Grid refinement around best point
+    if not perfect_points and use_grid and not search_cancelled():
+        print("\nPhase 2: Fine grid search...")
+        clock = phase_clock()
+        if 'grid' in resume['phases']:
+            print("  Finished in the run log")
+            L_final, s_final, avg_final, min_final, accs_final, perfect = \
+                resume['phases']['grid']['result']
         else:
-            L_best, s_best = L_start, s_start
-        
-        # Grid refinement around best point
-        if use_grid:
-            print("\nPhase 2: Fine grid search...")
-            L_final, s_final, avg_final, min_final, accs_final, perfect = grid_search_local(
-                L_best, s_best,
-                L_range=25,
-                s_range=0.01,
-                L_steps=21,
-                s_steps=21
-            )
+            log_event('phase', start=index, phase='grid', status='begin')
+            if ratio_mode:
+                # Same ±25 L, ±0.01 s box, projected onto R
+                R_min, R_max = ratio_bounds((L_best - 25, L_best + 25),
+                                            (s_best - 0.01, s_best + 0.01))
+                L_final, s_final, avg_final, min_final, accs_final, perfect = grid_search_local_R(
+                    R_min, R_max, R_steps=101, s_ref=s_best
+                )
+            else:
+                L_final, s_final, avg_final, min_final, accs_final, perfect = grid_search_local(
+                    L_best, s_best,
+                    L_range=25,
+                    s_range=0.01,
+                    L_steps=21,
+                    s_steps=21,
+                    n_workers=grid_workers
+                )
             
-            if perfect:
-                print("★ PERFECT FOUND IN GRID!")
-                perfect_points.append((L_final, s_final, avg_final, accs_final))
-            
-            all_results.append({
-                'start_L': L_start,
-                'start_s': s_start,
-                'final_L': L_final,
-                'final_s': s_final,
-                'avg_accuracy': avg_final,
-                'min_accuracy': min_final,
-                'accuracies': accs_final,
-                'perfect': perfect
-            })
+            if not search_cancelled():
+                log_event('phase', start=index, phase='grid', status='end',
+                          result=[L_final, s_final, avg_final, min_final, accs_final, perfect])
+        record_phase(index, 'grid', clock)
+        
+        if perfect:
+            print("★ PERFECT FOUND IN GRID!")
+            perfect_points.append((L_final, s_final, avg_final, accs_final))
+        
+        output['result'] = {
+            'start_L': L_start,
+            'start_s': s_start,
+            'final_L': L_final,
+            'final_s': s_final,
+            'avg_accuracy': avg_final,
+            'min_accuracy': min_final,
+            'accuracies': accs_final,
+            'perfect': perfect
+        }
+    
+    if perfect_points and CANCEL_EVENT is not None:
+        CANCEL_EVENT.set()
+    
+    output['cancelled'] = search_cancelled() and not perfect_points
+    if not output['cancelled']:
+        log_event('start_done', start=index, output=output)
+    output['cache'] = {'hits': cache.hits - hits_before,
+                       'misses': cache.misses - misses_before}
+    return output
+
+def init_search_worker(cancel_event, chamber_kwargs, cache_size, disk_cache,
+                       run_log=None, prefill=False, instrument_log=None):
+    """
+    Pool initializer: shared cancel flag plus the parent's chamber settings
+    (prefill: load the run log's evaluations into this worker's caches)
+    """
+    global CANCEL_EVENT, RUN_LOG
+    CANCEL_EVENT, RUN_LOG = cancel_event, run_log
+    set_instrument_log(instrument_log)
+    configure_chamber(cache_size=cache_size, disk_cache=disk_cache, **chamber_kwargs)
+    if prefill and run_log is not None:
+        prefill_caches(run_log.records())
+
+def find_perfect_point(starting_points, use_hamiltonian=True, use_grid=True,
+                       ratio_mode=False, n_workers=1, grid_workers=1,
+                       resume=None):
+    """
+    Multi-strategy search for perfect 100% point
+    
+    Strategy:
+    1. Start from multiple known good points
+    2. Use Hamiltonian dynamics to explore landscape
+    3. Do fine grid search around promising regions
+    4. Look for the perfect configuration
+    
+    ratio_mode=True runs both phases as 1-D searches over R = L/s
+    
+    With n_workers > 1 every starting point is a pool task; results are
+    reported as they finish, and the first perfect point cancels the
+    remaining trajectories, grid scans and queued starts.
+    
+    grid_workers > 1 tiles each (L, s) grid search over its own pool; it
+    only applies to serial starts (pool workers cannot start pools).
+    
+    resume (from resume_state) skips finished starts, phases and steps;
+    pool workers then prefill their caches from RUN_LOG.
+    """
+    
+    print("="*80)
+    print("SEARCHING FOR PERFECT 100% CONFIGURATION")
+    print("="*80)
+    print(f"Start time: {datetime.now().strftime('%H:%M:%S')}")
+    print(f"Starting points: {len(starting_points)}")
+    print(f"Strategies: Hamiltonian={'YES' if use_hamiltonian else 'NO'}, Grid={'YES' if use_grid else 'NO'}")
+    print(f"Parameterization: {'R = L/s (1-D)' if ratio_mode else '(L, s)'}")
+    print(f"Workers: {n_workers} (grid: {grid_workers if n_workers <= 1 else 1})")
+    print()
+    
+    search = partial(search_from_start, n_starts=len(starting_points),
+                     use_hamiltonian=use_hamiltonian, use_grid=use_grid,
+                     ratio_mode=ratio_mode,
+                     grid_workers=grid_workers if n_workers <= 1 else 1)
+    resume = resume or {}
+    tasks = [(index, point, resume.get(index)) for index, point in enumerate(starting_points)]
+    outputs = []
+    
+    if n_workers <= 1:
+        outputs = [search(task) for task in tasks]
+    else:
+        cancel_event = mp.Event()
+        with mp.Pool(processes=n_workers, initializer=init_search_worker,
+                     initargs=(cancel_event, dict(CHAMBER_KWARGS),
+                               ACCURACY_CACHE.maxsize, DISK_CACHE, RUN_LOG,
+                               bool(resume), INSTRUMENT_LOG)) as pool:
+            for output in pool.imap_unordered(search, tasks):
+                outputs.append(output)
+                L_start, s_start = starting_points[output['index']]
+                if output['perfect_points']:
+                    cancel_event.set()
+                    status = "★ PERFECT - cancelling remaining starts"
+                elif output['cancelled']:
+                    status = "cancelled"
+                elif output['result'] is not None:
+                    status = f"min={output['result']['min_accuracy']:.4f}%"
+                else:
+                    status = "done"
+                print(f"\n[{len(outputs)}/{len(tasks)}] Start {output['index']+1} "
+                      f"(L={L_start}, s={s_start}): {status}")
+    
+    outputs.sort(key=lambda output: output['index'])
+    all_results = [output['result'] for output in outputs if output['result'] is not None]
+    perfect_points = [point for output in outputs for point in output['perfect_points']]
     
     # Summary
     print("\n" + "="*80)
@@ -367,6 +1185,16 @@ def find_perfect_point(starting_points, use_hamiltonian=True, use_grid=True):
         for name, acc in sorted(best['accuracies'].items(), key=lambda x: x[1], reverse=True):
             print(f"    {name:25s}: {acc:.8f}%")
     
+    hits = sum(output.get('cache', {}).get('hits', 0) for output in outputs)
+    misses = sum(output.get('cache', {}).get('misses', 0) for output in outputs)
+    lookups = hits + misses
+    print(f"\nEvaluation cache: {hits} hits, {misses} misses "
+          f"({100*hits/lookups if lookups else 0.0:.1f}% hit ratio)")
+    if DISK_CACHE is not None:
+        disk = DISK_CACHE.stats()
+        print(f"Disk cache: {disk['hits']} hits, {disk['misses']} misses, "
+              f"{disk['entries']} entries ({disk['bytes'] / 1e6:.1f} MB)")
+    
     return all_results, perfect_points
 
 # ============================================================================
@@ -379,10 +1207,83 @@ def main():
                        help='Skip Hamiltonian dynamics (grid only)')
     parser.add_argument('--no-grid', action='store_true',
                        help='Skip grid search (Hamiltonian only)')
+    parser.add_argument('--ratio-mode', action='store_true',
+                       help='Search R = L/s directly (1-D, cached by R)')
+    parser.add_argument('--analytic-peaks', action='store_true',
+                       help='Exact peaks from the closed-form field (Newton-refined) '
+                            'instead of the sample grid')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                       help='Entries kept in the per-process evaluation cache')
+    parser.add_argument('--disk-cache', type=str, default=None, metavar='PATH',
+                       help='SQLite file of stored peaks/accuracies, reused across runs')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Starting points searched in parallel '
+                            '(default: one per start, up to the CPU count; 1 = serial)')
+    parser.add_argument('--grid-workers', type=int, default=None,
+                       help='Processes per grid search when starts run serially '
+                            '(default: CPU count)')
+    parser.add_argument('--ensemble', type=int, default=0, metavar='N',
+                       help='Run N Hamiltonian trajectories from Latin-hypercube seeds '
+                            'and add the best endpoints as starting points')
+    parser.add_argument('--ensemble-seed', type=int, default=None,
+                       help='Seed for the Latin-hypercube starts')
+    parser.add_argument('--branch-and-bound', action='store_true',
+                       help='Prove over the whole box (analytic peaks) which R = L/s can '
+                            'reach the threshold, instead of the multi-start search')
+    parser.add_argument('--bnb-threshold', type=float, default=None,
+                       help='Threshold for --branch-and-bound (default: PERFECT_THRESHOLD)')
+    parser.add_argument('--landscape', type=str, default=None, metavar='DIR',
+                       help='Precomputed landscape (python -m chamber.landscape build); '
+                            'its best candidates become starting points')
+    parser.add_argument('--log', type=str, default=None, metavar='PATH',
+                       help='Append-only JSON lines run log '
+                            '(default: the output path with .log.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue the run in --log: skip finished starts, phases and '
+                            'trajectory steps, and prefill the caches from it')
+    parser.add_argument('--instrument', type=str, default=None, metavar='PATH',
+                       help='Write per-phase timing, stage times and cache counters as '
+                            'JSON lines to PATH and print a summary at exit')
     parser.add_argument('--output', type=str, default='./perfect_point_search.json',
                        help='Output file for results')
     
     args = parser.parse_args()
+    run_start = time.perf_counter()
+    
+    overrides = {'peak_method': 'analytic'} if args.analytic_peaks else {}
+    disk_cache = DiskCache(args.disk_cache) if args.disk_cache else None
+    configure_chamber(cache_size=args.cache_size, disk_cache=disk_cache, **overrides)
+    
+    if args.branch_and_bound:
+        summary, perfect = branch_and_bound_search(args.bnb_threshold)
+        with open(args.output, 'w') as f:
+            json.dump({'timestamp': datetime.now().isoformat(),
+                       'branch_and_bound': summary,
+                       'perfect_points': perfect,
+                       'found_perfect': len(perfect) > 0}, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+        return
+    
+    global RUN_LOG
+    log_path = args.log or os.path.splitext(args.output)[0] + '.log.jsonl'
+    run_log = RunLog(log_path)
+    config = {'chamber': dict(CHAMBER_KWARGS), 'ratio_mode': args.ratio_mode,
+              'use_hamiltonian': not args.no_hamiltonian, 'use_grid': not args.no_grid}
+    records, run = [], None
+    if args.resume:
+        records = list(run_log.records())
+        run = next((record for record in records if record['event'] == 'run'), None)
+        if run is not None and run['config'] != config:
+            raise SystemExit(f"{log_path} was written with different settings: {run['config']}")
+        print(f"Resuming from {log_path}: {prefill_caches(records)} logged evaluations cached")
+    else:
+        run_log.truncate()
+    RUN_LOG = run_log
+    
+    if args.instrument:
+        instrument_log = RunLog(args.instrument)
+        instrument_log.truncate()
+        set_instrument_log(instrument_log)
     
     # Known good starting points
     starting_points = [
@@ -395,10 +1296,48 @@ def main():
         (147.97, 0.1),     # Original optimization
     ]
     
+    if run is not None:
+        starting_points = [tuple(point) for point in run['starting_points']]
+    
+    if args.ensemble > 0 and run is None:
+        print("="*80)
+        print("HAMILTONIAN ENSEMBLE SCAN")
+        print("="*80)
+        seeds = latin_hypercube_starts(args.ensemble, seed=args.ensemble_seed)
+        clock = phase_clock()
+        trajectories = hamiltonian_ensemble(seeds, n_steps=30, dt=0.5)
+        record_phase(None, 'ensemble', clock)
+        best_points = sorted((max(trajectory, key=lambda x: x['min_accuracy'])
+                              for trajectory in trajectories if trajectory),
+                             key=lambda x: x['min_accuracy'], reverse=True)
+        for point in best_points[:ENSEMBLE_STARTS]:
+            print(f"  Ensemble start: L={point['L']:.3f}, s={point['s']:.4f}, "
+                  f"min={point['min_accuracy']:.4f}%")
+            starting_points.append((float(point['L']), float(point['s'])))
+        print()
+    
+    if args.landscape and run is None:
+        print("="*80)
+        print("PRECOMPUTED LANDSCAPE CANDIDATES")
+        print("="*80)
+        clock = phase_clock()
+        for L, s, _ in landscape_starts(Landscape(args.landscape)):
+            starting_points.append((float(L), float(s)))
+        record_phase(None, 'landscape', clock)
+        print()
+    
+    log_event('run', config=config, starting_points=starting_points, resumed=args.resume)
+    
+    n_workers = args.workers or min(len(starting_points), mp.cpu_count())
+    
     results, perfect = find_perfect_point(
         starting_points,
         use_hamiltonian=not args.no_hamiltonian,
-        use_grid=not args.no_grid
+        use_grid=not args.no_grid,
+        ratio_mode=args.ratio_mode,
+        n_workers=n_workers,
+        grid_workers=args.grid_workers or mp.cpu_count(),
+        resume=resume_state(records)
     )
     
     # Save results
@@ -407,9 +1346,19 @@ def main():
         'starting_points': starting_points,
         'all_results': results,
         'perfect_points': [(p[0], p[1], p[2], p[3]) for p in perfect],
-        'found_perfect': len(perfect) > 0
+        'found_perfect': len(perfect) > 0,
+        'cache_stats': cache_stats() if n_workers == 1 else None,
+        'run_log': log_path
     }
     
+    if INSTRUMENT_LOG is not None:
+        n_processes = n_workers if n_workers > 1 else (args.grid_workers or mp.cpu_count())
+        summary = summarize_instrumentation(INSTRUMENT_LOG.records(),
+                                            time.perf_counter() - run_start, n_processes)
+        INSTRUMENT_LOG.append('summary', **summary)
+        print_instrumentation(summary)
+        output_data['instrumentation'] = summary
+    
     with open(args.output, 'w') as f:
         json.dump(output_data, f, indent=2)
     
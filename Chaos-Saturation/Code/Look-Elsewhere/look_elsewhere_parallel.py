@@ -13,10 +13,10 @@ Options:
     --trials: Number of random trials (default: 100, recommend 1000 for publication)
     --workers: Number of parallel workers (default: auto-detect, max 32)
     --resume: Resume from saved checkpoint if exists
+    --alpha: Stop early once the empirical p-value is settled against ALPHA
 """
 
 import numpy as np
-from scipy.signal import find_peaks
 from scipy.optimize import differential_evolution
 from scipy import stats
 import matplotlib.pyplot as plt
@@ -27,6 +27,14 @@ from functools import partial
 import argparse
 import os
 import pickle
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from chamber import CONSTANTS as DEFAULT_CONSTANTS
+from chamber import (DiskCache, RatioEvaluator, ResonanceChamber, RunLog,
+                     auto_num_points, batch_accuracies, cached_chamber_accuracies,
+                     load_codata, match_errors, ratio_bounds, read_records,
+                     split_ratio)
 
 # ============================================================================
 # CONFIGURATION
@@ -35,116 +43,159 @@ import pickle
 # Reduce memory footprint for parallel processing
 CHAMBER_POINTS = 8000  # Reduced from 15000 for memory efficiency
 PEAK_SAMPLE_LIMIT = 100  # Limit peak pairs for speed
+PEAK_WINDOW = 15  # Limit to nearby pairs for speed
 OPTIMIZATION_MAXITER = 40  # Slightly reduced for speed
 OPTIMIZATION_POPSIZE = 8  # Reduced for memory
 
+# Peak precision (set by --interpolation / --position-tolerance)
+PEAK_INTERPOLATION = None  # 'parabolic' or 'sinc' for sub-sample peak positions
+POSITION_TOLERANCE = None  # Modelled peak error / chamber length; None = fixed CHAMBER_POINTS
+
+# Persistent peak/accuracy store shared by all workers and reruns (--disk-cache)
+DISK_CACHE = None
+
+# Checkpoint log: fsync after this many finished tasks (a killed process
+# loses nothing either way; this bounds what a power loss can take)
+CHECKPOINT_FSYNC_EVERY = 10
+
+# Sequential stopping (--alpha): confidence of the exceedance interval.
+# It is re-checked after every trial, so keep it well above 1 - alpha.
+SEQUENTIAL_CONFIDENCE = 0.99
+
+# Optimization box
+L_BOUNDS = (100, 5000)
+S_BOUNDS = (0.05, 0.5)
+
 # ============================================================================
-# CORE RESONANCE CHAMBER (Optimized for parallel)
+# CORE RESONANCE CHAMBER (shared engine in ../chamber)
 # ============================================================================
 
-class ResonanceChamber:
-    """Lightweight chamber for parallel processing"""
+def make_chamber(chamber_size, shortest_wavelength=None):
+    """
+    Lightweight chamber for parallel processing
     
-    def __init__(self, chamber_size):
-        self.chamber_size = chamber_size
-        self.num_points = CHAMBER_POINTS
-        self.x = np.linspace(0, chamber_size, self.num_points)
-        
-    def generate_wave(self, wavelength):
-        k = 2 * np.pi / wavelength
-        return np.sin(k * self.x)
-    
-    def compute_interference(self, wavelengths):
-        total_field = np.zeros(len(self.x))
-        for wl in wavelengths:
-            if wl > 0:
-                total_field += self.generate_wave(wl)
-        return total_field
-    
-    def extract_ratios(self, field):
-        peaks, _ = find_peaks(np.abs(field), prominence=0.5)
-        
-        if len(peaks) < 2:
-            return []
-        
-        peak_positions = self.x[peaks]
-        
-        ratios = []
-        sample_size = min(PEAK_SAMPLE_LIMIT, len(peak_positions))
-        sampled_peaks = peak_positions[::max(1, len(peak_positions)//sample_size)]
-        
-        # Limit to nearby pairs for speed
-        for i in range(len(sampled_peaks)):
-            for j in range(i+1, min(i+15, len(sampled_peaks))):
-                ratio = sampled_peaks[j] / sampled_peaks[i]
-                if 1.01 < ratio < 3000:
-                    ratios.append(ratio)
-        
-        return ratios
+    With POSITION_TOLERANCE set, the grid is the smallest one whose
+    modelled interpolation error is within tolerance for this chamber and
+    wavelength set (see auto_num_points: not a guarantee that every peak
+    is resolved).
+    """
+    num_points = CHAMBER_POINTS
+    if POSITION_TOLERANCE is not None and shortest_wavelength is not None:
+        num_points = auto_num_points(chamber_size, shortest_wavelength,
+                                     POSITION_TOLERANCE * chamber_size,
+                                     PEAK_INTERPOLATION)
+    return ResonanceChamber(chamber_size, num_points=num_points,
+                            sample_limit=PEAK_SAMPLE_LIMIT, window=PEAK_WINDOW,
+                            interpolation=PEAK_INTERPOLATION)
+
+
+def set_resolution(interpolation=None, position_tolerance=None):
+    """Select sub-sample interpolation and automatic grid sizing"""
+    global PEAK_INTERPOLATION, POSITION_TOLERANCE
+    PEAK_INTERPOLATION = interpolation
+    POSITION_TOLERANCE = position_tolerance
+
+
+# Target constants (shared 10-constant set, widened by --catalog)
+CONSTANTS = dict(DEFAULT_CONSTANTS)
+CONSTANT_VALUES = np.array(list(CONSTANTS.values()))
+
+
+def set_targets(constants):
+    """
+    Replace the target set
     
-    def find_best_match(self, ratios, target):
-        if not ratios:
-            return None, float('inf')
-        
-        differences = [abs(r - target) for r in ratios]
-        min_diff = min(differences)
-        best_ratio = ratios[differences.index(min_diff)]
-        
-        return best_ratio, min_diff
+    Matching goes through a sorted ratio index, so hundreds of targets
+    cost about the same per evaluation as the default 10.
+    """
+    global CONSTANTS, CONSTANT_VALUES
+    CONSTANTS = dict(constants)
+    CONSTANT_VALUES = np.array(list(CONSTANTS.values()))
+
+
+def set_disk_cache(disk_cache):
+    """Route every evaluation through a DiskCache (None disables it)"""
+    global DISK_CACHE
+    DISK_CACHE = disk_cache
+
 
+def set_chamber_points(num_points):
+    """Grid size of every fixed-resolution chamber"""
+    global CHAMBER_POINTS
+    CHAMBER_POINTS = num_points
 
-# Target constants
-CONSTANTS = {
-    'fine_structure': 137.035999084,
-    'phi': 1.618033988749895,
-    'pi': 3.141592653589793,
-    'e': 2.718281828459045,
-    'proton_electron_mass': 1836.15267343,
-    'weak_mixing_angle': 28.74,
-    'muon_electron_mass': 206.7682830,
-    'sqrt_2': 1.414213562373095,
-    'sqrt_3': 1.732050807568877,
-    'sqrt_5': 2.236067977499790,
-}
+
+def init_worker(constants, chamber_points, interpolation, position_tolerance,
+                disk_cache=None):
+    """Pool initializer: copy the parent's targets, peak settings and disk cache"""
+    set_targets(constants)
+    set_chamber_points(chamber_points)
+    set_resolution(interpolation, position_tolerance)
+    set_disk_cache(disk_cache)
 
 
 def test_configuration_error(chamber_size, wavelength_scale, wavelengths_base):
     """Fast error computation for optimization"""
     wavelengths = [w * wavelength_scale for w in wavelengths_base]
     
-    chamber = ResonanceChamber(chamber_size)
+    chamber = make_chamber(chamber_size, min(wavelengths))
+    if DISK_CACHE is not None:
+        # Mean of error/target, with unmatched targets counting as 1.0
+        accuracies = cached_chamber_accuracies(DISK_CACHE, chamber, wavelengths_base,
+                                               CONSTANT_VALUES, scale=wavelength_scale)
+        return np.mean(1 - accuracies / 100)
+    
     field = chamber.compute_interference(wavelengths)
     ratios = chamber.extract_ratios(field)
     
-    if not ratios:
+    if len(ratios) == 0:
         return 1.0
     
-    errors = []
-    for target in CONSTANTS.values():
-        match, error = chamber.find_best_match(ratios, target)
-        if match is not None:
-            errors.append(error / target)
+    errors = match_errors(ratios, CONSTANT_VALUES) / CONSTANT_VALUES
     
-    return np.mean(errors) if errors else 1.0
+    return np.mean(errors)
+
+
+def population_errors(L_values, s_values, wavelengths_base):
+    """
+    test_configuration_error for a whole DE population in one batched pass
+    
+    Fields depend on (L, s) only through L/s, so every candidate shares
+    one unit grid: the population is synthesized, peak-searched and
+    matched together instead of building a ResonanceChamber per candidate.
+    Needs a fixed grid (POSITION_TOLERANCE unset).
+    """
+    accuracies = batch_accuracies(wavelengths_base, CONSTANT_VALUES,
+                                  L=L_values, s=s_values,
+                                  num_points=CHAMBER_POINTS,
+                                  sample_limit=PEAK_SAMPLE_LIMIT,
+                                  window=PEAK_WINDOW,
+                                  interpolation=PEAK_INTERPOLATION,
+                                  disk_cache=DISK_CACHE)
+    # Unmatched targets (accuracy 0) count as error 1.0, as in the scalar path
+    return np.mean(1 - accuracies / 100, axis=1)
 
 
 def compute_accuracy_detailed(chamber_size, wavelength_scale, wavelengths_base):
     """Detailed accuracy for final results"""
     wavelengths = [w * wavelength_scale for w in wavelengths_base]
     
-    chamber = ResonanceChamber(chamber_size)
+    chamber = make_chamber(chamber_size, min(wavelengths))
+    if DISK_CACHE is not None:
+        accuracies = cached_chamber_accuracies(DISK_CACHE, chamber, wavelengths_base,
+                                               CONSTANT_VALUES, scale=wavelength_scale)
+        return summarize_accuracies(accuracies)
+    
     field = chamber.compute_interference(wavelengths)
     ratios = chamber.extract_ratios(field)
     
-    accuracies = []
-    for target in CONSTANTS.values():
-        match, error = chamber.find_best_match(ratios, target)
-        if match is not None:
-            accuracy = 100 * (1 - error / target)
-            accuracies.append(accuracy)
-        else:
-            accuracies.append(0.0)
+    accuracies = chamber.compute_accuracies(ratios, CONSTANT_VALUES)
     
+    return summarize_accuracies(accuracies)
+
+
+def summarize_accuracies(accuracies):
+    """(average, count >= 99%, count >= 99.9%) for an accuracy vector"""
     avg_acc = np.mean(accuracies)
     above_99 = sum(1 for a in accuracies if a >= 99.0)
     above_999 = sum(1 for a in accuracies if a >= 99.9)
@@ -156,16 +207,25 @@ def compute_accuracy_detailed(chamber_size, wavelength_scale, wavelengths_base):
 # OPTIMIZATION (Single-threaded per trial)
 # ============================================================================
 
-def optimize_wavelengths(wavelengths_base, trial_id=None):
+def optimize_wavelengths(wavelengths_base, trial_id=None, ratio_mode=False):
     """
     Optimize single wavelength set
     This function will be called in parallel for different wavelength sets
     """
+    if ratio_mode:
+        return optimize_wavelengths_R(wavelengths_base, trial_id=trial_id)
+    
+    # Auto-sized grids differ per candidate, so only a fixed grid batches
+    vectorized = POSITION_TOLERANCE is None
+    
     def objective(params):
         L, s = params
+        if vectorized:
+            # params is (2, population): one batched pass per generation
+            return population_errors(L, s, wavelengths_base)
         return test_configuration_error(L, s, wavelengths_base)
     
-    bounds = [(100, 5000), (0.05, 0.5)]
+    bounds = [L_BOUNDS, S_BOUNDS]
     
     # Use seed based on trial_id for reproducibility
     seed = trial_id if trial_id is not None else None
@@ -179,6 +239,7 @@ def optimize_wavelengths(wavelengths_base, trial_id=None):
         seed=seed,
         workers=1,  # Don't nest parallelism
         updating='deferred',
+        vectorized=vectorized,
         disp=False
     )
     
@@ -199,6 +260,56 @@ def optimize_wavelengths(wavelengths_base, trial_id=None):
     }
 
 
+def optimize_wavelengths_R(wavelengths_base, trial_id=None):
+    """
+    Optimize single wavelength set over R = L/s only
+    
+    The error depends on (L, s) only through L/s, so a 1-D search over R
+    covers the same landscape as the 2-D (L, s) search. Evaluations are
+    cached by R for the lifetime of this call.
+    """
+    evaluator = RatioEvaluator(wavelengths_base, CONSTANT_VALUES,
+                               num_points=CHAMBER_POINTS,
+                               sample_limit=PEAK_SAMPLE_LIMIT,
+                               window=PEAK_WINDOW,
+                               interpolation=PEAK_INTERPOLATION,
+                               relative_tolerance=POSITION_TOLERANCE,
+                               disk_cache=DISK_CACHE)
+    
+    def objective(params):
+        # Mean relative error; 1.0 when no ratios (all accuracies 0)
+        return np.mean(1 - evaluator.accuracies(params[0]) / 100)
+    
+    seed = trial_id if trial_id is not None else None
+    
+    result = differential_evolution(
+        objective,
+        [ratio_bounds(L_BOUNDS, S_BOUNDS)],
+        maxiter=OPTIMIZATION_MAXITER,
+        popsize=OPTIMIZATION_POPSIZE,
+        tol=1e-8,
+        seed=seed,
+        workers=1,
+        updating='deferred',
+        disp=False
+    )
+    
+    optimal_R = float(result.x[0])
+    optimal_L, optimal_s = split_ratio(optimal_R, L_BOUNDS, S_BOUNDS)
+    
+    avg_acc, above_99, above_999 = summarize_accuracies(evaluator.accuracies(optimal_R))
+    
+    return {
+        'trial_id': trial_id,
+        'optimal_L': optimal_L,
+        'optimal_s': optimal_s,
+        'optimal_R': optimal_R,
+        'avg_accuracy': avg_acc,
+        'above_99': above_99,
+        'above_999': above_999
+    }
+
+
 # ============================================================================
 # WAVELENGTH GENERATION
 # ============================================================================
@@ -235,7 +346,7 @@ def generate_random_wavelengths(seed=None):
 # PARALLEL EXECUTION
 # ============================================================================
 
-def run_single_trial(trial_id):
+def run_single_trial(trial_id, ratio_mode=False):
     """
     Run single random trial (to be parallelized)
     
@@ -245,21 +356,120 @@ def run_single_trial(trial_id):
     random_wl = generate_random_wavelengths(seed=trial_id + 1000)
     
     # Optimize configuration
-    result = optimize_wavelengths(random_wl, trial_id=trial_id)
+    result = optimize_wavelengths(random_wl, trial_id=trial_id, ratio_mode=ratio_mode)
     
     return result
 
 
+def run_task(task, ratio_mode=False):
+    """
+    One pool task: ('prime_even', None) or ('trial', trial_id)
+    Returns: (kind, result)
+    """
+    kind, trial_id = task
+    if kind == 'prime_even':
+        return kind, optimize_wavelengths(generate_prime_even_wavelengths(), trial_id=0,
+                                          ratio_mode=ratio_mode)
+    return kind, run_single_trial(trial_id, ratio_mode=ratio_mode)
+
+
+def load_checkpoint(checkpoint_file):
+    """
+    Rebuild (null_results, prime_even_result) by streaming the checkpoint log
+    
+    A task recorded twice keeps its last record. A pre-log checkpoint.pkl
+    next to the log is read when the log does not exist yet.
+    """
+    legacy_file = os.path.splitext(checkpoint_file)[0] + '.pkl'
+    if not os.path.exists(checkpoint_file) and os.path.exists(legacy_file):
+        with open(legacy_file, 'rb') as f:
+            checkpoint = pickle.load(f)
+        return checkpoint['null_results'], checkpoint.get('prime_even_result')
+    
+    trials = {}
+    prime_even_result = None
+    for record in read_records(checkpoint_file):
+        if record['event'] == 'trial':
+            trials[record['result']['trial_id']] = record['result']
+        elif record['event'] == 'prime_even':
+            prime_even_result = record['result']
+    return list(trials.values()), prime_even_result
+
+
+def compact_checkpoint(checkpoint_log, null_results, prime_even_result):
+    """Rewrite the checkpoint log as one record per finished task"""
+    records = [{'event': 'trial', 'result': result} for result in null_results]
+    if prime_even_result is not None:
+        records.insert(0, {'event': 'prime_even', 'result': prime_even_result})
+    checkpoint_log.compact(records)
+
+
+def print_prime_even_result(prime_even_result):
+    print(f"\nPrime+Even Results (OUR RESULT):")
+    print(f"  Optimal L: {prime_even_result['optimal_L']:.2f}")
+    print(f"  Optimal s: {prime_even_result['optimal_s']:.3f}")
+    print(f"  Average accuracy: {prime_even_result['avg_accuracy']:.4f}%")
+    print(f"  Constants ≥99%: {prime_even_result['above_99']}/{len(CONSTANTS)}")
+    print(f"  Constants ≥99.9%: {prime_even_result['above_999']}/{len(CONSTANTS)}")
+    print()
+
+
+# ============================================================================
+# SEQUENTIAL STOPPING
+# ============================================================================
+
+def exceedance_interval(exceedances, n, confidence=SEQUENTIAL_CONFIDENCE):
+    """Clopper-Pearson interval for P(null trial >= us) from exceedances of n"""
+    tail = (1 - confidence) / 2
+    lower = stats.beta.ppf(tail, exceedances, n - exceedances + 1) if exceedances > 0 else 0.0
+    upper = stats.beta.ppf(1 - tail, exceedances + 1, n - exceedances) if exceedances < n else 1.0
+    return float(lower), float(upper)
+
+
+def sequential_decision(null_results, prime_even_result, alpha,
+                        confidence=SEQUENTIAL_CONFIDENCE):
+    """
+    'significant', 'not significant', or None to keep sampling
+    
+    Decided once the exceedance interval lies entirely below alpha
+    (significant) or entirely above it (not significant).
+    """
+    if alpha is None or prime_even_result is None or not null_results:
+        return None
+    exceedances = sum(1 for r in null_results
+                      if r['avg_accuracy'] >= prime_even_result['avg_accuracy'])
+    lower, upper = exceedance_interval(exceedances, len(null_results), confidence)
+    if upper < alpha:
+        return 'significant'
+    if lower > alpha:
+        return 'not significant'
+    return None
+
+
 def run_parallel_test(n_trials=100, n_workers=None, resume=False, 
-                     checkpoint_file='checkpoint.pkl'):
+                     checkpoint_file='checkpoint.jsonl', ratio_mode=False,
+                     alpha=None, confidence=SEQUENTIAL_CONFIDENCE):
     """
     Run corrected significance test in parallel
     
+    The prime+even optimization and every null trial are independent pool
+    tasks streamed with imap_unordered, so no worker waits on a chunk
+    barrier and the prime+even run overlaps the null trials. Each finished
+    task is appended to a JSON Lines checkpoint log (fsync every
+    CHECKPOINT_FSYNC_EVERY records); the log is compacted on resume and
+    at the end of the run.
+    
+    With alpha set, n_trials is a budget: sampling stops as soon as
+    sequential_decision settles the empirical p-value against alpha.
+    
     Args:
-        n_trials: Number of random trials
+        n_trials: Number of random trials (the budget when alpha is set)
         n_workers: Number of parallel workers (None = auto-detect)
         resume: Resume from checkpoint if exists
-        checkpoint_file: Path to checkpoint file
+        checkpoint_file: Path to checkpoint log
+        ratio_mode: Optimize over R = L/s (1-D) instead of (L, s)
+        alpha: Significance level for sequential stopping (None = run all trials)
+        confidence: Confidence of the exceedance interval used to stop
     """
     
     # Auto-detect cores if not specified
@@ -273,8 +483,12 @@ def run_parallel_test(n_trials=100, n_workers=None, resume=False,
     print("LOOK-ELSEWHERE CORRECTED SIGNIFICANCE TEST (PARALLEL)")
     print("="*80)
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Total trials: {n_trials}")
+    print(f"Total trials: {n_trials}" + (" (budget)" if alpha is not None else ""))
+    if alpha is not None:
+        print(f"Sequential stopping: alpha = {alpha}, {confidence:.1%} exceedance interval")
     print(f"Parallel workers: {n_workers}")
+    print(f"Search space: {'R = L/s (1-D)' if ratio_mode else '(L, s)'}")
+    print(f"Target constants: {len(CONSTANTS)}")
     print(f"Estimated time: {n_trials * 10 / n_workers / 60:.1f} minutes")
     print()
     
@@ -283,70 +497,74 @@ def run_parallel_test(n_trials=100, n_workers=None, resume=False,
     null_results = []
     prime_even_result = None
     
-    if resume and os.path.exists(checkpoint_file):
+    checkpoint_log = RunLog(checkpoint_file, fsync_every=CHECKPOINT_FSYNC_EVERY)
+    
+    if resume:
         print(f"Loading checkpoint from {checkpoint_file}...")
-        with open(checkpoint_file, 'rb') as f:
-            checkpoint = pickle.load(f)
-            start_trial = checkpoint['completed_trials']
-            null_results = checkpoint['null_results']
-            prime_even_result = checkpoint.get('prime_even_result')
-        print(f"Resuming from trial {start_trial}/{n_trials}")
+        null_results, prime_even_result = load_checkpoint(checkpoint_file)
+        # Drop duplicates and any torn last line before appending again
+        compact_checkpoint(checkpoint_log, null_results, prime_even_result)
+        start_trial = len(null_results)
+        print(f"Resuming with {start_trial}/{n_trials} trials done")
         print()
+    else:
+        checkpoint_log.truncate()
+    
+    # Trials finish out of order, so resume by trial id, not by count
+    done = {r['trial_id'] for r in null_results}
+    remaining_trials = [trial_id for trial_id in range(n_trials) if trial_id not in done]
+    
+    # A resumed run may already be decided
+    decision = sequential_decision(null_results, prime_even_result, alpha, confidence)
+    if decision is not None:
+        remaining_trials = []
     
-    # Optimize prime+even if not done yet
+    # Prime+even goes first so it starts at once, alongside the null trials
+    tasks = [('trial', trial_id) for trial_id in remaining_trials]
     if prime_even_result is None:
-        print("Optimizing prime+even configuration...")
-        prime_even_wl = generate_prime_even_wavelengths()
-        prime_even_result = optimize_wavelengths(prime_even_wl, trial_id=0)
-        
-        print(f"\nPrime+Even Results (OUR RESULT):")
-        print(f"  Optimal L: {prime_even_result['optimal_L']:.2f}")
-        print(f"  Optimal s: {prime_even_result['optimal_s']:.3f}")
-        print(f"  Average accuracy: {prime_even_result['avg_accuracy']:.4f}%")
-        print(f"  Constants ≥99%: {prime_even_result['above_99']}/10")
-        print(f"  Constants ≥99.9%: {prime_even_result['above_999']}/10")
-        print()
+        tasks.insert(0, ('prime_even', None))
+        print("Optimizing prime+even configuration (overlapped with the null trials)...")
     
-    # Generate null distribution in parallel
-    if start_trial < n_trials:
+    if tasks:
         print(f"{'='*80}")
         print("Generating null distribution (PARALLEL)...")
         print(f"{'='*80}\n")
         
-        remaining_trials = list(range(start_trial, n_trials))
-        
-        # Create progress tracking
-        completed = start_trial
-        checkpoint_interval = 10
+        completed = len(null_results)
         
-        # Use pool for parallel processing
-        with mp.Pool(processes=n_workers) as pool:
-            # Process in chunks for checkpointing
-            chunk_size = checkpoint_interval
-            
-            for i in range(0, len(remaining_trials), chunk_size):
-                chunk = remaining_trials[i:i+chunk_size]
+        # Stream tasks: each worker picks up the next one as soon as it is free
+        with mp.Pool(processes=n_workers, initializer=init_worker,
+                     initargs=(CONSTANTS, CHAMBER_POINTS, PEAK_INTERPOLATION,
+                               POSITION_TOLERANCE, DISK_CACHE)) as pool:
+            for kind, result in pool.imap_unordered(
+                    partial(run_task, ratio_mode=ratio_mode), tasks):
+                # Record every finished task before taking the next result
+                checkpoint_log.append(kind, result=result)
+                if kind == 'prime_even':
+                    prime_even_result = result
+                    print_prime_even_result(prime_even_result)
+                else:
+                    null_results.append(result)
+                    completed += 1
+                    progress = completed / n_trials * 100
+                    print(f"Progress: {completed}/{n_trials} ({progress:.1f}%) "
+                          f"- trial {result['trial_id']}: {result['avg_accuracy']:.4f}%")
                 
-                # Process chunk in parallel
-                chunk_results = pool.map(run_single_trial, chunk)
-                null_results.extend(chunk_results)
-                
-                completed += len(chunk)
-                progress = completed / n_trials * 100
-                
-                print(f"Progress: {completed}/{n_trials} ({progress:.1f}%)")
-                
-                # Save checkpoint
-                checkpoint = {
-                    'completed_trials': completed,
-                    'null_results': null_results,
-                    'prime_even_result': prime_even_result
-                }
-                with open(checkpoint_file, 'wb') as f:
-                    pickle.dump(checkpoint, f)
+                decision = sequential_decision(null_results, prime_even_result,
+                                               alpha, confidence)
+                if decision is not None:
+                    # Leaving the pool terminates the trials still running
+                    break
         
+    if decision is not None:
+        print(f"\nStopped after {len(null_results)}/{n_trials} trials: "
+              f"{decision.upper()} at alpha = {alpha}")
+    elif tasks:
         print(f"\nCompleted all {n_trials} trials!")
     
+    null_results.sort(key=lambda r: r['trial_id'])
+    compact_checkpoint(checkpoint_log, null_results, prime_even_result)
+    
     # Compute statistics
     print(f"\n{'='*80}")
     print("COMPUTING STATISTICS...")
@@ -365,6 +583,11 @@ def run_parallel_test(n_trials=100, n_workers=None, resume=False,
     
     better_than_us = sum(1 for acc in null_avg_acc 
                         if acc >= prime_even_result['avg_accuracy'])
+    total_trials = len(null_results)
+    
+    # Empirical p-value: fraction of the null at or above us
+    empirical_p = better_than_us / total_trials
+    empirical_interval = exceedance_interval(better_than_us, total_trials, confidence)
     
     print(f"\nNull Distribution (Random + Optimization):")
     print(f"  Mean: {null_mean:.4f}%")
@@ -378,7 +601,11 @@ def run_parallel_test(n_trials=100, n_workers=None, resume=False,
     print(f"\nSignificance:")
     print(f"  Z-score: {z_score:.2f}σ")
     print(f"  P-value: {p_value:.2e}")
-    print(f"  Random ≥ us: {better_than_us}/{n_trials}")
+    print(f"  Random ≥ us: {better_than_us}/{total_trials}")
+    print(f"  Empirical p: {empirical_p:.2e} "
+          f"({confidence:.1%} CI [{empirical_interval[0]:.2e}, {empirical_interval[1]:.2e}])")
+    if decision is not None:
+        print(f"  Sequential decision: {decision} at alpha = {alpha}")
     
     if z_score > 3:
         print(f"\n  ✓ SIGNIFICANT (>{z_score:.1f}σ)")
@@ -399,7 +626,10 @@ def run_parallel_test(n_trials=100, n_workers=None, resume=False,
             'z_score': z_score,
             'p_value': p_value,
             'better_than_us': better_than_us,
-            'total_trials': n_trials
+            'total_trials': total_trials,
+            'empirical_p_value': empirical_p,
+            'empirical_p_interval': empirical_interval,
+            'decision': decision
         }
     }
 
@@ -460,6 +690,27 @@ def main():
                        help='Number of parallel workers (default: auto)')
     parser.add_argument('--resume', action='store_true',
                        help='Resume from checkpoint if exists')
+    parser.add_argument('--alpha', type=float, default=None,
+                       help='Stop early once the empirical p-value is decisively above '
+                            'or below ALPHA (--trials becomes the budget)')
+    parser.add_argument('--confidence', type=float, default=SEQUENTIAL_CONFIDENCE,
+                       help='Confidence of the exceedance interval used by --alpha '
+                            '(default: %g)' % SEQUENTIAL_CONFIDENCE)
+    parser.add_argument('--ratio-mode', action='store_true',
+                       help='Optimize over R = L/s only (1-D search)')
+    parser.add_argument('--catalog', type=str, default=None,
+                       help='CODATA allascii.txt to add to the target constants')
+    parser.add_argument('--chamber-points', type=int, default=CHAMBER_POINTS,
+                       help='Grid points per chamber (default: %d)' % CHAMBER_POINTS)
+    parser.add_argument('--interpolation', choices=['parabolic', 'sinc'], default=None,
+                       help='Sub-sample peak interpolation (default: grid positions)')
+    parser.add_argument('--position-tolerance', type=float, default=None,
+                       help='Auto-size chamber grids so the modelled interpolation error '
+                            'is < TOL * chamber length; does not ensure every peak is '
+                            'resolved (default: fixed %d points)' % CHAMBER_POINTS)
+    parser.add_argument('--disk-cache', type=str, default=None, metavar='PATH',
+                       help='SQLite file of stored peaks/accuracies shared by workers '
+                            'and reruns')
     parser.add_argument('--output-dir', type=str, default='./outputs',
                        help='Output directory (default: ./outputs)')
     
@@ -468,14 +719,24 @@ def main():
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
     
-    checkpoint_file = os.path.join(args.output_dir, 'checkpoint.pkl')
+    checkpoint_file = os.path.join(args.output_dir, 'checkpoint.jsonl')
+    
+    if args.catalog:
+        set_targets({**DEFAULT_CONSTANTS, **load_codata(args.catalog)})
+    set_resolution(args.interpolation, args.position_tolerance)
+    set_chamber_points(args.chamber_points)
+    if args.disk_cache:
+        set_disk_cache(DiskCache(args.disk_cache))
     
     # Run test
     results = run_parallel_test(
         n_trials=args.trials,
         n_workers=args.workers,
         resume=args.resume,
-        checkpoint_file=checkpoint_file
+        checkpoint_file=checkpoint_file,
+        ratio_mode=args.ratio_mode,
+        alpha=args.alpha,
+        confidence=args.confidence
     )
     
     # Create plots
@@ -488,7 +749,8 @@ def main():
         'metadata': {
             'timestamp': datetime.now().isoformat(),
             'n_trials': args.trials,
-            'n_workers': args.workers if args.workers else mp.cpu_count()
+            'n_workers': args.workers if args.workers else mp.cpu_count(),
+            'n_constants': len(CONSTANTS)
         },
         'prime_even_result': results['prime_even_result'],
         'null_distribution': {
@@ -500,7 +762,11 @@ def main():
         'statistics': {
             'z_score': float(results['statistics']['z_score']),
             'p_value': float(results['statistics']['p_value']),
-            'better_than_us': results['statistics']['better_than_us']
+            'better_than_us': results['statistics']['better_than_us'],
+            'total_trials': results['statistics']['total_trials'],
+            'empirical_p_value': results['statistics']['empirical_p_value'],
+            'empirical_p_interval': results['statistics']['empirical_p_interval'],
+            'decision': results['statistics']['decision']
         }
     }
     
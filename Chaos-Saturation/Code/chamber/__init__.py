@@ -0,0 +1,57 @@
+"""
+Shared resonance chamber engine for the Chaos-Saturation scripts
+
+Scripts in sibling folders add Chaos-Saturation/Code to sys.path and import:
+
+    from chamber import ResonanceChamber, compute_accuracies
+"""
+
+from .core import (
+    DEFAULT_NUM_POINTS,
+    DEFAULT_POINTS_PER_WAVELENGTH,
+    DEFAULT_PROMINENCE,
+    DEFAULT_SAMPLE_LIMIT,
+    DEFAULT_WINDOW,
+    PEAK_METHODS,
+    RATIO_MAX,
+    RATIO_MIN,
+    ResonanceChamber,
+    compute_accuracies,
+    field_peak_positions,
+    field_ratios,
+    find_best_match,
+    match_errors,
+    peak_ratios,
+    position_ratios,
+    sample_peaks,
+    sin_outer,
+    synthesize_field,
+)
+from .batch import (
+    DEFAULT_BATCH_MEMORY,
+    batch_accuracies,
+    iter_batch_accuracies,
+    synthesize_fields,
+)
+from .cache import DEFAULT_CACHE_SIZE, LRUCache, quantize
+from .constants import CONSTANTS, load_codata
+from .diskcache import (DEFAULT_DISK_CACHE_BYTES, DiskCache,
+                        cached_chamber_accuracies)
+from .invariant import (
+    RatioEvaluator,
+    ratio_bounds,
+    ratio_key,
+    split_ratio,
+)
+from .instrument import STAGE_TIMES, STAGES, timed
+from .interpolation import (
+    INTERPOLATION_METHODS,
+    auto_num_points,
+    position_error,
+    refine_peak_positions,
+)
+from .matching import RatioIndex
+from .peaks import analytic_peak_positions
+from .pruning import ExtremumTable, branch_and_bound, cell_upper_bound
+from .runlog import RunLog, read_records
+from .screening import WorstFirstOrder, screen_accuracies
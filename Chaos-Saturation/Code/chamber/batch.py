@@ -0,0 +1,182 @@
+"""
+Batched Accuracy Evaluation
+
+Evaluates many parameter points in one call and returns the full
+(points x targets) accuracy matrix.
+
+Every point is reduced to R = L/s (see invariant.py), so all fields share
+the unit grid u = linspace(0, 1, N):
+
+    field[p, :] = sum_w sin(2*pi * R[p] * u / w)
+
+Points are synthesized in chunks whose (chunk x N) field block stays under
+a memory budget, so a 10^5-point landscape scan runs in bounded RAM while
+each sine pass still covers thousands of samples at once.
+"""
+
+import numpy as np
+
+from .core import (
+    DEFAULT_NUM_POINTS,
+    DEFAULT_POINTS_PER_WAVELENGTH,
+    DEFAULT_PROMINENCE,
+    DEFAULT_SAMPLE_LIMIT,
+    DEFAULT_WINDOW,
+    analytic_peak_positions,
+    compute_accuracies,
+    field_peak_positions,
+    position_ratios,
+    sin_outer,
+)
+from .diskcache import accuracies_key, peaks_key
+from .instrument import timed
+from .screening import screen_accuracies
+
+# Bytes allowed for one chunk's field block plus its sine temporary
+DEFAULT_BATCH_MEMORY = 16 * 1024 * 1024
+
+# ============================================================================
+# INPUTS
+# ============================================================================
+
+def as_ratio_array(L=None, s=None, R=None):
+    """Flatten (L, s) arrays or an R array into a 1-D float64 R array"""
+    if R is not None:
+        if L is not None or s is not None:
+            raise ValueError("Pass either R or (L, s), not both")
+        return np.asarray(R, dtype=np.float64).ravel()
+    if L is None or s is None:
+        raise ValueError("Pass both L and s (or R)")
+    L, s = np.broadcast_arrays(np.asarray(L, dtype=np.float64),
+                               np.asarray(s, dtype=np.float64))
+    return (L / s).ravel()
+
+
+def chunk_size_for(num_points, dtype=np.float64, memory_limit=DEFAULT_BATCH_MEMORY):
+    """Points per chunk so the field block and one sine temporary fit the budget"""
+    # Field in dtype, phase temporaries in float64
+    per_point = num_points * (np.dtype(dtype).itemsize + 8)
+    return max(1, memory_limit // per_point)
+
+# ============================================================================
+# SYNTHESIS
+# ============================================================================
+
+@timed('synthesis')
+def synthesize_fields(R_values, u, wavelengths_base, dtype=np.float64):
+    """
+    Fields for a block of R values on the shared unit grid
+
+    Returns a (len(R_values), len(u)) array. One (points x N) sine pass per
+    wavelength, accumulated in place.
+    """
+    R_values = np.asarray(R_values, dtype=np.float64)
+    fields = np.zeros((len(R_values), len(u)), dtype=dtype)
+
+    for w in np.asarray(wavelengths_base, dtype=np.float64):
+        if w > 0:
+            fields += sin_outer(2 * np.pi * R_values / w, u, dtype)
+
+    return fields
+
+# ============================================================================
+# BATCH EVALUATION
+# ============================================================================
+
+def block_peak_positions(R_block, u, wavelengths_base, dtype, prominence,
+                         peak_method, points_per_wavelength, interpolation):
+    """
+    Peak positions for each R in a block
+
+    Sampled positions are on the unit grid u; analytic ones are on [0, R].
+    Either way their ratios are the chamber's peak ratios.
+    """
+    if peak_method == 'analytic':
+        return [analytic_peak_positions(wavelengths_base, R_value, prominence,
+                                        points_per_wavelength)
+                for R_value in R_block]
+    fields = synthesize_fields(R_block, u, wavelengths_base, dtype)
+    return [field_peak_positions(field, u, prominence, interpolation)
+            for field in fields]
+
+
+def iter_batch_accuracies(wavelengths_base, targets, L=None, s=None, R=None,
+                          num_points=DEFAULT_NUM_POINTS, dtype=np.float64,
+                          prominence=DEFAULT_PROMINENCE,
+                          sample_limit=DEFAULT_SAMPLE_LIMIT, window=DEFAULT_WINDOW,
+                          memory_limit=DEFAULT_BATCH_MEMORY, peak_method='sampled',
+                          points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH,
+                          interpolation=None, disk_cache=None, threshold=None,
+                          order=None):
+    """
+    Yield (start, accuracies) per chunk, accuracies shaped (chunk, targets)
+
+    Lets callers stop early (e.g. on a perfect point) without paying for
+    the remaining chunks. With peak_method='analytic' no fields are
+    synthesized; peaks come from the closed-form field point by point.
+    With a disk_cache, stored points are read back and only the misses
+    are synthesized; their peaks and accuracies are stored.
+
+    threshold (a number, or a callable read before each point) screens
+    synthesized points with screen_accuracies in the given order: a row
+    rejected below threshold holds NaN for the targets it never matched.
+    Only complete rows are stored in the disk cache.
+    """
+    R_all = as_ratio_array(L, s, R)
+    targets = np.asarray(targets, dtype=np.float64)
+    u = np.linspace(0, 1, num_points)
+    chunk = chunk_size_for(num_points, dtype, memory_limit)
+
+    for start in range(0, len(R_all), chunk):
+        block = R_all[start:start + chunk]
+        accuracies = np.empty((len(block), len(targets)))
+        todo = np.arange(len(block))
+
+        if disk_cache is not None:
+            pkeys = [peaks_key(wavelengths_base, R_value, num_points, dtype,
+                               prominence, peak_method, points_per_wavelength,
+                               interpolation)
+                     for R_value in block]
+            akeys = [accuracies_key(key, sample_limit, window, targets) for key in pkeys]
+            cached = [disk_cache.get(key) for key in akeys]
+            for row, values in enumerate(cached):
+                if values is not None:
+                    accuracies[row] = values
+            todo = np.array([row for row, values in enumerate(cached) if values is None],
+                            dtype=int)
+
+        if len(todo):
+            all_positions = block_peak_positions(block[todo], u, wavelengths_base,
+                                                 dtype, prominence, peak_method,
+                                                 points_per_wavelength, interpolation)
+            for row, positions in zip(todo, all_positions):
+                ratios = position_ratios(positions, sample_limit, window)
+                if threshold is None:
+                    accuracies[row] = compute_accuracies(ratios, targets)
+                else:
+                    level = threshold() if callable(threshold) else threshold
+                    accuracies[row] = screen_accuracies(ratios, targets, level, order)[0]
+                if disk_cache is not None:
+                    # Stored peaks are in canonical (s = 1) chamber units
+                    scale = 1.0 if peak_method == 'analytic' else block[row]
+                    disk_cache.put(pkeys[row], positions * scale)
+                    if not np.isnan(accuracies[row]).any():
+                        disk_cache.put(akeys[row], accuracies[row])
+
+        yield start, accuracies
+
+
+def batch_accuracies(wavelengths_base, targets, L=None, s=None, R=None, **kwargs):
+    """
+    Accuracy matrix (points x targets) for arrays of (L, s) or of R
+
+    Keyword arguments are passed to iter_batch_accuracies (num_points,
+    dtype, prominence, sample_limit, window, memory_limit, peak_method,
+    points_per_wavelength, interpolation, disk_cache).
+    """
+    R_all = as_ratio_array(L, s, R)
+    result = np.empty((len(R_all), len(np.atleast_1d(targets))))
+    for start, accuracies in iter_batch_accuracies(wavelengths_base, targets,
+                                                   R=R_all, **kwargs):
+        result[start:start + len(accuracies)] = accuracies
+    return result
@@ -0,0 +1,232 @@
+"""
+Chamber Microbenchmarks
+
+Per-stage time and peak memory of the chamber hot path over a sweep of
+grid sizes, wavelength sets and ratio windows:
+
+    cd Chaos-Saturation/Code
+    python -m chamber.bench                          # print the table
+    python -m chamber.bench --output baseline.json   # save a baseline
+    python -m chamber.bench --compare baseline.json  # flag slowdowns (exit 1)
+
+Stages:
+    compute_interference     field synthesis
+    extract_ratios           peak finding + banded ratios
+    find_best_match          per-constant closest-ratio loop
+    compute_accuracies       all targets through the ratio index
+    compute_accuracy_vector  end to end (ratios + accuracies)
+
+Times are the best of --repeat runs (median also saved). Peak memory is
+measured in a separate tracemalloc run, so tracing never skews timings.
+"""
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from .constants import CONSTANTS
+from .core import ResonanceChamber
+
+DEFAULT_NUM_POINTS_SWEEP = (4000, 8000, 12000, 15000)
+DEFAULT_WINDOWS = (15, 20, None)
+DEFAULT_REPEAT = 5
+DEFAULT_SLOWDOWN = 0.2        # Flag stages more than 20% slower than baseline
+
+BENCH_L, BENCH_S = 2997.0, 0.338   # Dual-optimization chamber
+BENCH_SAMPLE_LIMIT = 150
+RANDOM_SEED = 0
+
+# ============================================================================
+# WORKLOADS
+# ============================================================================
+
+def prime_even_wavelengths():
+    """First 30 primes + first 30 even numbers (look-elsewhere's reference set)"""
+    primes = []
+    n = 2
+    while len(primes) < 30:
+        if all(n % p for p in primes):
+            primes.append(float(n))
+        n += 1
+    return primes + [float(2 * n) for n in range(1, 31)]
+
+
+WAVELENGTH_SETS = {
+    'integer30': [float(w) for w in range(1, 31)],
+    'prime_even60': prime_even_wavelengths(),
+    'random60': np.random.default_rng(RANDOM_SEED).uniform(2.0, 113.0, 60).tolist(),
+}
+
+
+def stage_functions(num_points, wavelengths_base, window):
+    """name -> zero-argument callable for every benchmarked stage"""
+    chamber = ResonanceChamber(BENCH_L, num_points=num_points,
+                               sample_limit=BENCH_SAMPLE_LIMIT, window=window)
+    wavelengths = [w * BENCH_S for w in wavelengths_base]
+    targets = np.array(list(CONSTANTS.values()))
+
+    field = chamber.compute_interference(wavelengths)
+    ratios = chamber.extract_ratios(field)
+
+    def best_matches():
+        return [chamber.find_best_match(ratios, target) for target in targets]
+
+    def accuracy_vector():
+        return chamber.compute_accuracies(chamber.compute_ratios(wavelengths), targets)
+
+    return {
+        'compute_interference': lambda: chamber.compute_interference(wavelengths),
+        'extract_ratios': lambda: chamber.extract_ratios(field),
+        'find_best_match': best_matches,
+        'compute_accuracies': lambda: chamber.compute_accuracies(ratios, targets),
+        'compute_accuracy_vector': accuracy_vector,
+    }
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def time_call(fn, repeat=DEFAULT_REPEAT):
+    """(best, median) wall time in seconds over repeat calls, after one warm-up"""
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), float(np.median(times))
+
+
+def peak_memory(fn):
+    """Peak bytes traced (Python + numpy buffers) during one call"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(num_points_sweep=DEFAULT_NUM_POINTS_SWEEP,
+                   wavelength_sets=None, windows=DEFAULT_WINDOWS,
+                   repeat=DEFAULT_REPEAT, verbose=True):
+    """One record per (num_points, wavelength set, window, stage)"""
+    if wavelength_sets is None:
+        wavelength_sets = list(WAVELENGTH_SETS)
+
+    records = []
+    for num_points in num_points_sweep:
+        for set_name in wavelength_sets:
+            wavelengths_base = WAVELENGTH_SETS[set_name]
+            for window in windows:
+                for stage, fn in stage_functions(num_points, wavelengths_base,
+                                                 window).items():
+                    best, median = time_call(fn, repeat)
+                    record = {
+                        'num_points': num_points,
+                        'wavelength_set': set_name,
+                        'n_wavelengths': len(wavelengths_base),
+                        'window': window,
+                        'stage': stage,
+                        'best_s': best,
+                        'median_s': median,
+                        'peak_bytes': peak_memory(fn),
+                    }
+                    records.append(record)
+                    if verbose:
+                        print(format_record(record))
+    return records
+
+
+def format_record(record):
+    window = 'all' if record['window'] is None else record['window']
+    return (f"{record['num_points']:>7d}  {record['wavelength_set']:<13s} "
+            f"{str(window):>4s}  {record['stage']:<24s} "
+            f"{1e3 * record['best_s']:10.3f} ms {1e3 * record['median_s']:10.3f} ms "
+            f"{record['peak_bytes'] / 1024:10.1f} KiB")
+
+# ============================================================================
+# BASELINES
+# ============================================================================
+
+def record_key(record):
+    return (record['num_points'], record['wavelength_set'], record['window'],
+            record['stage'])
+
+
+def metadata(repeat):
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'repeat': repeat,
+    }
+
+
+def compare(records, baseline, slowdown=DEFAULT_SLOWDOWN):
+    """Records whose best time exceeds the baseline's by more than slowdown"""
+    reference = {record_key(r): r for r in baseline['results']}
+    regressions = []
+    for record in records:
+        base = reference.get(record_key(record))
+        if base is None or base['best_s'] <= 0:
+            continue
+        ratio = record['best_s'] / base['best_s']
+        if ratio > 1 + slowdown:
+            regressions.append(dict(record, baseline_s=base['best_s'], ratio=ratio))
+    return regressions
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Chamber hot-path microbenchmarks')
+    parser.add_argument('--num-points', type=int, nargs='+',
+                        default=list(DEFAULT_NUM_POINTS_SWEEP))
+    parser.add_argument('--sets', nargs='+', choices=list(WAVELENGTH_SETS),
+                        default=list(WAVELENGTH_SETS))
+    parser.add_argument('--windows', nargs='+', default=[str(w) for w in DEFAULT_WINDOWS],
+                        help="Ratio windows ('None' = all pairs)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--output', type=str, default=None,
+                        help='Save results as a JSON baseline')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='Baseline JSON to check against')
+    parser.add_argument('--slowdown', type=float, default=DEFAULT_SLOWDOWN,
+                        help='Allowed fractional slowdown before flagging (default 0.2)')
+    args = parser.parse_args()
+
+    windows = [None if w == 'None' else int(w) for w in args.windows]
+
+    print(f"{'points':>7s}  {'set':<13s} {'win':>4s}  {'stage':<24s} "
+          f"{'best':>13s} {'median':>13s} {'peak mem':>14s}")
+    records = run_benchmarks(args.num_points, args.sets, windows, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': metadata(args.repeat), 'results': records}, f, indent=2)
+        print(f"\nBaseline saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(records, baseline, args.slowdown)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than baseline by > {100*args.slowdown:.0f}%:")
+            for r in regressions:
+                print(f"  {format_record(r)}  ({r['ratio']:.2f}x of {1e3 * r['baseline_s']:.3f} ms)")
+            raise SystemExit(1)
+        print(f"\nNo stage slower than baseline by > {100*args.slowdown:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
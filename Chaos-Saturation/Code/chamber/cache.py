@@ -0,0 +1,76 @@
+"""
+Evaluation Caches
+
+Bounded in-process LRU memo for chamber evaluations. Keys are quantized
+parameters, so points that differ only by floating-point noise (the
+centre of a gradient stencil vs. the trajectory point it came from)
+share one entry.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 4096
+DEFAULT_KEY_DIGITS = 12   # Significant digits kept by quantize()
+
+
+def quantize(value, digits=DEFAULT_KEY_DIGITS):
+    """Round a float to a fixed number of significant digits (for cache keys)"""
+    return float(f"{float(value):.{digits - 1}e}")
+
+
+class LRUCache:
+    """Least-recently-used mapping with a size bound and hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """Cached value (counted as a hit) or default (counted as a miss)"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, calling compute() and storing it on a miss"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Counters as a JSON-friendly dict"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,71 @@
+"""
+Target Constants
+
+CONSTANTS holds the 10 targets used throughout the paper. load_codata()
+widens the target set with every dimensionless value from a NIST CODATA
+ASCII table (https://physics.nist.gov/cuu/Constants/Table/allascii.txt)
+that a peak ratio can actually reach.
+"""
+
+from .core import RATIO_MAX, RATIO_MIN
+
+CONSTANTS = {
+    'fine_structure': 137.035999084,
+    'phi': 1.618033988749895,
+    'pi': 3.141592653589793,
+    'e': 2.718281828459045,
+    'proton_electron_mass': 1836.15267343,
+    'weak_mixing_angle': 28.74,
+    'muon_electron_mass': 206.7682830,
+    'sqrt_2': 1.414213562373095,
+    'sqrt_3': 1.732050807568877,
+    'sqrt_5': 2.236067977499790,
+}
+
+# Fixed-width columns of the NIST allascii.txt table
+CODATA_COLUMNS = {
+    'quantity': (0, 60),
+    'value': (60, 85),
+    'uncertainty': (85, 110),
+    'unit': (110, None),
+}
+
+
+def parse_codata_value(text):
+    """'7294.299 541 71' / '1.380 649 e-23' / '299 792 458' -> float"""
+    return float(text.replace(' ', '').replace('...', ''))
+
+
+def load_codata(path, min_value=RATIO_MIN, max_value=RATIO_MAX,
+                dimensionless_only=True):
+    """
+    Read a CODATA allascii.txt table into {quantity: value}
+
+    Keeps values inside (min_value, max_value) - the range peak ratios can
+    take. With dimensionless_only, rows with a unit are skipped.
+    """
+    catalog = {}
+    in_table = False
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('-----'):
+                in_table = True
+                continue
+            if not in_table or not line.strip():
+                continue
+
+            fields = {name: line[start:stop].strip()
+                      for name, (start, stop) in CODATA_COLUMNS.items()}
+            if dimensionless_only and fields['unit']:
+                continue
+
+            try:
+                value = parse_codata_value(fields['value'])
+            except ValueError:
+                continue
+
+            if min_value < value < max_value:
+                catalog[fields['quantity']] = value
+
+    return catalog
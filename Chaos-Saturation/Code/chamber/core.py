@@ -0,0 +1,257 @@
+"""
+Resonance Chamber Engine
+
+One shared implementation of the 1D resonance chamber used by the finder,
+the look-elsewhere test and the topology tests.
+
+Pipeline:
+1. Synthesize the interference field (sum of sines) on the sample grid
+2. Find peaks of |field|
+3. Build ratios between sampled peak positions
+4. Match ratios against target constants
+
+Every stage works on whole NumPy arrays - no per-wavelength temporaries.
+"""
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from .instrument import timed
+from .interpolation import INTERPOLATION_METHODS, refine_peak_positions
+from .matching import RatioIndex
+from .peaks import DEFAULT_POINTS_PER_WAVELENGTH, analytic_peak_positions
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_NUM_POINTS = 12000
+DEFAULT_PROMINENCE = 0.5
+DEFAULT_SAMPLE_LIMIT = 150   # Max peaks kept for ratio generation
+DEFAULT_WINDOW = 20          # Pair peak i with peaks j < i + window (None = all pairs)
+
+PEAK_METHODS = ('sampled', 'analytic')
+
+RATIO_MIN = 1.01
+RATIO_MAX = 3000
+
+# Upper bound on elements in one (wavelengths x points) sine block
+SYNTHESIS_BLOCK_ELEMENTS = 1 << 20
+
+# ============================================================================
+# FIELD SYNTHESIS
+# ============================================================================
+
+def sin_outer(k, x, dtype=np.float64):
+    """
+    sin(outer(k, x)) as a dtype array
+
+    Phases reach 2*pi * L / min(wavelength) ~ 10^5 rad, far beyond single
+    precision, so for narrower dtypes the phase is reduced to one period in
+    float64 before the (much faster) low-precision sine.
+    """
+    k = np.asarray(k, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    if np.dtype(dtype) == np.float64:
+        phase = np.multiply.outer(k, x)
+        return np.sin(phase, out=phase)
+
+    cycles = np.multiply.outer(k / (2 * np.pi), x)
+    cycles -= np.rint(cycles)
+    phase = (2 * np.pi * cycles).astype(dtype)
+    return np.sin(phase, out=phase)
+
+
+@timed('synthesis')
+def synthesize_field(x, wavelengths, dtype=np.float64,
+                     block_elements=SYNTHESIS_BLOCK_ELEMENTS):
+    """
+    Sum of sin(2*pi*x / wl) over all positive wavelengths
+
+    Wavelengths are processed in blocks so the temporary sine matrix
+    never exceeds block_elements entries.
+    """
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    wl = wl[wl > 0]
+
+    field = np.zeros(len(x), dtype=dtype)
+    if len(wl) == 0:
+        return field
+
+    k = 2 * np.pi / wl
+    rows = max(1, block_elements // max(1, len(x)))
+
+    for start in range(0, len(k), rows):
+        field += sin_outer(k[start:start + rows], x, dtype).sum(axis=0)
+
+    return field
+
+# ============================================================================
+# PEAKS AND RATIOS
+# ============================================================================
+
+def sample_peaks(peak_positions, sample_limit=DEFAULT_SAMPLE_LIMIT):
+    """Evenly thin peak positions down to roughly sample_limit entries"""
+    sample_size = min(sample_limit, len(peak_positions))
+    return peak_positions[::max(1, len(peak_positions) // max(1, sample_size))]
+
+
+def peak_ratios(sampled_peaks, window=DEFAULT_WINDOW):
+    """
+    Ratios sampled[j] / sampled[i] for i < j < i + window
+
+    Built from a banded (n x window-1) view of the peaks, or from the upper
+    triangle when window is None. Returns a contiguous float64 array in
+    (i, j) order, filtered to (RATIO_MIN, RATIO_MAX).
+    """
+    peaks = np.ascontiguousarray(sampled_peaks, dtype=np.float64)
+    n = len(peaks)
+    if n < 2 or (window is not None and window < 2):
+        return np.empty(0, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if window is None or window >= n:
+            i, j = np.triu_indices(n, k=1)
+            ratios = peaks[j] / peaks[i]
+        else:
+            # Row i holds peaks[i+1 : i+window], NaN-padded past the end
+            band = window - 1
+            padded = np.concatenate([peaks[1:], np.full(band, np.nan)])
+            neighbours = np.lib.stride_tricks.sliding_window_view(padded, band)
+            ratios = (neighbours / peaks[:, None]).ravel()
+
+    # NaN padding fails both comparisons and drops out here
+    return ratios[(ratios > RATIO_MIN) & (ratios < RATIO_MAX)]
+
+
+@timed('ratios')
+def position_ratios(peak_positions, sample_limit=DEFAULT_SAMPLE_LIMIT,
+                    window=DEFAULT_WINDOW):
+    """Peak positions -> sampled peak-position ratios"""
+    if len(peak_positions) < 2:
+        return np.empty(0, dtype=np.float64)
+    return peak_ratios(sample_peaks(peak_positions, sample_limit), window)
+
+
+@timed('peaks')
+def field_peak_positions(field, x, prominence=DEFAULT_PROMINENCE, interpolation=None):
+    """Positions on grid x of the peaks of |field| with the given prominence"""
+    peaks, _ = find_peaks(np.abs(field), prominence=prominence)
+    return refine_peak_positions(field, x, peaks, interpolation)
+
+
+def field_ratios(field, x, prominence=DEFAULT_PROMINENCE,
+                 sample_limit=DEFAULT_SAMPLE_LIMIT, window=DEFAULT_WINDOW,
+                 interpolation=None):
+    """
+    Peaks of |field| on grid x -> sampled peak-position ratios
+
+    interpolation ('parabolic' or 'sinc') refines peaks to sub-sample
+    positions before the ratios are formed.
+    """
+    positions = field_peak_positions(field, x, prominence, interpolation)
+    return position_ratios(positions, sample_limit, window)
+
+# ============================================================================
+# MATCHING
+# ============================================================================
+
+def find_best_match(ratios, target):
+    """Closest ratio to target. Returns (ratio, |ratio - target|)"""
+    ratios = np.asarray(ratios, dtype=np.float64)
+    if len(ratios) == 0:
+        return None, float('inf')
+    differences = np.abs(ratios - target)
+    idx = int(np.argmin(differences))
+    return float(ratios[idx]), float(differences[idx])
+
+
+def match_errors(ratios, targets):
+    """
+    Absolute error of the closest ratio for every target at once
+
+    ratios may be a plain array or a prebuilt RatioIndex. Returns an array
+    shaped like targets (inf where there are no ratios).
+    """
+    if not isinstance(ratios, RatioIndex):
+        ratios = RatioIndex(ratios)
+    return ratios.errors(targets)
+
+
+@timed('matching')
+def compute_accuracies(ratios, targets):
+    """Percent accuracy 100 * (1 - error / target) per target (0 if unmatched)"""
+    targets = np.asarray(targets, dtype=np.float64)
+    errors = match_errors(ratios, targets)
+    accuracies = 100 * (1 - errors / targets)
+    accuracies[~np.isfinite(errors)] = 0.0
+    return accuracies
+
+# ============================================================================
+# RESONANCE CHAMBER
+# ============================================================================
+
+class ResonanceChamber:
+    """
+    1D resonance chamber with vectorized synthesis, peak finding and matching
+
+    peak_method='analytic' makes compute_ratios locate peaks from the
+    closed-form field (see peaks.py) instead of the num_points sample grid.
+    interpolation refines sampled peaks to sub-sample positions.
+    """
+
+    def __init__(self, chamber_size, num_points=DEFAULT_NUM_POINTS,
+                 dtype=np.float64, prominence=DEFAULT_PROMINENCE,
+                 sample_limit=DEFAULT_SAMPLE_LIMIT, window=DEFAULT_WINDOW,
+                 peak_method='sampled',
+                 points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH,
+                 interpolation=None):
+        if peak_method not in PEAK_METHODS:
+            raise ValueError(f"peak_method must be one of {PEAK_METHODS}, got {peak_method!r}")
+        if interpolation not in INTERPOLATION_METHODS:
+            raise ValueError(f"interpolation must be one of {INTERPOLATION_METHODS}, got {interpolation!r}")
+        self.chamber_size = chamber_size
+        self.num_points = num_points
+        self.dtype = np.dtype(dtype)
+        self.prominence = prominence
+        self.sample_limit = sample_limit
+        self.window = window
+        self.peak_method = peak_method
+        self.points_per_wavelength = points_per_wavelength
+        self.interpolation = interpolation
+        self.x = np.linspace(0, chamber_size, num_points)
+
+    def generate_wave(self, wavelength):
+        k = 2 * np.pi / wavelength
+        return np.sin(k * self.x.astype(self.dtype))
+
+    def compute_interference(self, wavelengths):
+        return synthesize_field(self.x, wavelengths, dtype=self.dtype)
+
+    def find_peak_positions(self, field):
+        return field_peak_positions(field, self.x, self.prominence, self.interpolation)
+
+    def extract_ratios(self, field):
+        return field_ratios(field, self.x, self.prominence,
+                            self.sample_limit, self.window, self.interpolation)
+
+    def peak_positions(self, wavelengths):
+        """Wavelengths -> peak positions, using this chamber's peak_method"""
+        if self.peak_method == 'analytic':
+            return analytic_peak_positions(wavelengths, self.chamber_size,
+                                           self.prominence,
+                                           self.points_per_wavelength)
+        return self.find_peak_positions(self.compute_interference(wavelengths))
+
+    def compute_ratios(self, wavelengths):
+        """Wavelengths -> peak ratios, using this chamber's peak_method"""
+        if self.peak_method == 'analytic':
+            return position_ratios(self.peak_positions(wavelengths),
+                                   self.sample_limit, self.window)
+        return self.extract_ratios(self.compute_interference(wavelengths))
+
+    def find_best_match(self, ratios, target):
+        return find_best_match(ratios, target)
+
+    def compute_accuracies(self, ratios, targets):
+        return compute_accuracies(ratios, targets)
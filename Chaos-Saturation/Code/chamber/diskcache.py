@@ -0,0 +1,262 @@
+"""
+Persistent Evaluation Cache
+
+Content-addressed SQLite store for chamber results, shared by every script
+and by every worker of a process pool. Entries are float64 arrays keyed by
+a SHA-256 of everything that determines them:
+
+    peaks       wavelength set, R = L/s, num_points, dtype, prominence,
+                peak_method, points_per_wavelength, interpolation
+    accuracies  the peaks key plus sample_limit, window and the targets
+
+Peak positions are stored for the canonical s = 1 chamber of size R (see
+invariant.py), so every (L, s) on the same line shares one entry, and a
+new target set re-uses the stored peaks instead of re-synthesizing.
+
+The database runs in WAL mode with a busy timeout, so concurrent workers
+can read and write it. Each process opens its own connection lazily,
+which makes DiskCache objects safe to pickle into pool workers. When the
+stored payload exceeds max_bytes the least recently used entries are
+deleted until it is back under EVICT_FRACTION of the limit.
+
+Each process keeps a running total of the payload (seeded from the table
+on connect, updated by its own inserts and evictions) and re-reads the
+true total every RESYNC_EVERY puts to pick up other workers' writes.
+Access times of hits are buffered and written in one transaction every
+TOUCH_EVERY hits, before an eviction and on close, so lookups do not take
+the write lock.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from .cache import quantize
+from .core import compute_accuracies, position_ratios
+
+DEFAULT_DISK_CACHE_BYTES = 512 * 1024 * 1024
+EVICT_FRACTION = 0.9     # Evict down to this fraction of max_bytes
+BUSY_TIMEOUT = 60.0      # Seconds to wait for another writer
+CACHE_FORMAT = 1         # Bump to invalidate every stored key
+RESYNC_EVERY = 256       # Puts between re-reads of the true payload size
+TOUCH_EVERY = 64         # Hits between access-time flushes
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def content_key(kind, **fields):
+    """SHA-256 hex digest of a canonical JSON encoding of kind and fields"""
+    payload = json.dumps({'format': CACHE_FORMAT, 'kind': kind, **fields},
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def peaks_key(wavelengths_base, R, num_points, dtype, prominence, peak_method,
+              points_per_wavelength, interpolation):
+    """Key of the canonical peak positions on the line L/s = R"""
+    return content_key(
+        'peaks',
+        wavelengths=[float(w) for w in np.asarray(wavelengths_base, dtype=np.float64)],
+        R=quantize(R),
+        num_points=int(num_points),
+        dtype=np.dtype(dtype).name,
+        prominence=float(prominence),
+        peak_method=peak_method,
+        points_per_wavelength=points_per_wavelength if peak_method == 'analytic' else None,
+        interpolation=interpolation,
+    )
+
+
+def accuracies_key(peaks, sample_limit, window, targets):
+    """Key of the accuracy vector built from the peaks stored under peaks"""
+    return content_key(
+        'accuracies',
+        peaks=peaks,
+        sample_limit=sample_limit,
+        window=window,
+        targets=[float(t) for t in np.asarray(targets, dtype=np.float64)],
+    )
+
+
+def chamber_peaks_key(chamber, wavelengths_base, scale=1.0):
+    """peaks_key for a chamber driven by wavelengths_base * scale"""
+    return peaks_key(wavelengths_base, chamber.chamber_size / scale,
+                     chamber.num_points, chamber.dtype, chamber.prominence,
+                     chamber.peak_method, chamber.points_per_wavelength,
+                     chamber.interpolation)
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class DiskCache:
+    """SQLite-backed, size-bounded, LRU-evicting array store"""
+
+    def __init__(self, path, max_bytes=DEFAULT_DISK_CACHE_BYTES):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._bytes = 0        # Running payload total (this process's view)
+        self._puts = 0         # Puts since the last resync
+        self._touched = {}     # key -> access time not yet written
+
+    def __getstate__(self):
+        # Connections cannot cross processes; workers reopen on first use
+        state = dict(self.__dict__)
+        state['_conn'] = None
+        state['_pid'] = None
+        state['_touched'] = {}
+        return state
+
+    @property
+    def conn(self):
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'key TEXT PRIMARY KEY, data BLOB NOT NULL, '
+                         'size INTEGER NOT NULL, accessed REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed '
+                         'ON entries (accessed)')
+            self._conn, self._pid = conn, os.getpid()
+            self._bytes = self.total_bytes()
+            self._puts = 0
+            self._touched = {}
+        return self._conn
+
+    def get(self, key):
+        """Stored float64 array for key, or None"""
+        row = self.conn.execute('SELECT data FROM entries WHERE key = ?',
+                                (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_EVERY:
+            self.flush()
+        return np.frombuffer(row[0], dtype=np.float64)
+
+    def put(self, key, values):
+        """Store a float64 array under key, evicting old entries if over budget"""
+        data = np.ascontiguousarray(values, dtype=np.float64).tobytes()
+        # Keys are content hashes, so an existing entry already holds these values
+        inserted = self.conn.execute('INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?)',
+                                     (key, data, len(data), time.time())).rowcount
+        self._bytes += len(data) if inserted else 0
+        self._puts += 1
+        if self._puts >= RESYNC_EVERY:
+            self._bytes, self._puts = self.total_bytes(), 0
+        if self._bytes > self.max_bytes:
+            self.evict(int(EVICT_FRACTION * self.max_bytes))
+
+    def flush(self):
+        """Write the buffered access times of recent hits"""
+        if not self._touched or self._conn is None or self._pid != os.getpid():
+            return
+        touched = [(accessed, key) for key, accessed in self._touched.items()]
+        self._touched = {}
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('UPDATE entries SET accessed = ? WHERE key = ?', touched)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def get_or_compute(self, key, compute):
+        values = self.get(key)
+        if values is None:
+            values = compute()
+            self.put(key, values)
+        return values
+
+    def total_bytes(self):
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def evict(self, target_bytes):
+        """Delete least recently accessed entries until the payload fits target_bytes"""
+        self.flush()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            total = self.total_bytes()
+            excess = total - target_bytes
+            rows = conn.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall()
+            doomed = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                doomed.append((key,))
+                excess -= size
+                total -= size
+            conn.executemany('DELETE FROM entries WHERE key = ?', doomed)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._bytes, self._puts = total, 0
+
+    def clear(self):
+        self.conn.execute('DELETE FROM entries')
+        self._bytes, self._puts, self._touched = 0, 0, {}
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self.flush()
+            self._conn.close()
+        self._conn = None
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self):
+        """Counters for this process plus the shared store's size"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+            'bytes': self.total_bytes(),
+            'max_bytes': self.max_bytes,
+        }
+
+# ============================================================================
+# CHAMBER EVALUATION
+# ============================================================================
+
+def cached_chamber_accuracies(disk_cache, chamber, wavelengths_base, targets, scale=1.0):
+    """
+    Accuracies of chamber driven by wavelengths_base * scale, through disk_cache
+
+    Looks up the accuracy vector, then the canonical peaks; only a miss on
+    both synthesizes a field.
+    """
+    pkey = chamber_peaks_key(chamber, wavelengths_base, scale)
+    akey = accuracies_key(pkey, chamber.sample_limit, chamber.window, targets)
+
+    def compute():
+        positions = disk_cache.get_or_compute(
+            pkey, lambda: chamber.peak_positions(
+                np.asarray(wavelengths_base, dtype=np.float64) * scale) / scale)
+        ratios = position_ratios(positions, chamber.sample_limit, chamber.window)
+        return compute_accuracies(ratios, targets)
+
+    return disk_cache.get_or_compute(akey, compute)
@@ -0,0 +1,67 @@
+"""
+Stage Timing
+
+Opt-in wall-clock accounting of the chamber hot path. The functions that
+do the work of one evaluation are wrapped with @timed(stage):
+
+    synthesis   synthesize_field, synthesize_fields
+    peaks       field_peak_positions, analytic_peak_positions
+    ratios      position_ratios
+    matching    compute_accuracies, screen_accuracies
+
+Wrapped functions never call each other, so stages do not overlap, and
+every evaluated point makes exactly one 'matching' call (its count is the
+number of evaluations). Timing is off by default; a disabled wrapper costs
+one attribute check per call.
+"""
+
+import functools
+import time
+
+STAGES = ('synthesis', 'peaks', 'ratios', 'matching')
+
+
+class StageTimes:
+    """Per-process seconds and call counts per stage"""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+
+    def add(self, stage, seconds):
+        self.seconds[stage] += seconds
+        self.calls[stage] += 1
+
+    def snapshot(self):
+        """{stage: {'seconds', 'calls'}} so far"""
+        return {stage: {'seconds': self.seconds[stage], 'calls': self.calls[stage]}
+                for stage in STAGES}
+
+    def since(self, snapshot):
+        """Per-stage increments since an earlier snapshot()"""
+        return {stage: {'seconds': self.seconds[stage] - snapshot[stage]['seconds'],
+                        'calls': self.calls[stage] - snapshot[stage]['calls']}
+                for stage in STAGES}
+
+
+STAGE_TIMES = StageTimes()
+
+
+def timed(stage):
+    """Decorator: add the call's wall time to STAGE_TIMES[stage] when enabled"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not STAGE_TIMES.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_TIMES.add(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -0,0 +1,133 @@
+"""
+L/s Invariant Evaluation
+
+With x = linspace(0, L, N) and wavelengths w*s the phase of every wave is
+
+    2*pi * x / (w*s) = 2*pi * (L/s) * u / w,    u = linspace(0, 1, N)
+
+so the field samples, the peak indices and every peak-position ratio depend
+only on R = L/s. A chamber of size R driven by the unscaled wavelengths w
+(i.e. s = 1) is therefore the canonical representative of the whole line
+L/s = R, and searches over (L, s) collapse to 1-D searches over R.
+"""
+
+import numpy as np
+
+from .cache import DEFAULT_CACHE_SIZE, LRUCache, quantize
+from .core import (
+    DEFAULT_NUM_POINTS,
+    DEFAULT_POINTS_PER_WAVELENGTH,
+    DEFAULT_PROMINENCE,
+    DEFAULT_SAMPLE_LIMIT,
+    DEFAULT_WINDOW,
+    ResonanceChamber,
+    compute_accuracies,
+)
+from .diskcache import cached_chamber_accuracies
+from .interpolation import auto_num_points
+
+# Significant digits used to key the per-R cache
+RATIO_KEY_DIGITS = 12
+
+# ============================================================================
+# PARAMETER MAPPING
+# ============================================================================
+
+def ratio_key(R, digits=RATIO_KEY_DIGITS):
+    """Cache key for R (rounded to a fixed number of significant digits)"""
+    return quantize(R, digits)
+
+
+def ratio_bounds(L_bounds, s_bounds):
+    """Range of R = L/s reachable from box bounds on L and s"""
+    (L_lo, L_hi), (s_lo, s_hi) = L_bounds, s_bounds
+    return L_lo / s_hi, L_hi / s_lo
+
+
+def split_ratio(R, L_bounds, s_bounds, s_ref=None):
+    """
+    Pick a representative (L, s) with L/s = R inside the box bounds
+
+    s is chosen as close to s_ref as the bounds allow (middle of the
+    feasible s interval when s_ref is None).
+    """
+    (L_lo, L_hi), (s_lo, s_hi) = L_bounds, s_bounds
+    s_min = max(s_lo, L_lo / R)
+    s_max = min(s_hi, L_hi / R)
+    if s_min > s_max:
+        raise ValueError(f"R={R} is not reachable within L={L_bounds}, s={s_bounds}")
+
+    if s_ref is None:
+        s = 0.5 * (s_min + s_max)
+    else:
+        s = float(np.clip(s_ref, s_min, s_max))
+    return R * s, s
+
+# ============================================================================
+# R-PARAMETERIZED EVALUATOR
+# ============================================================================
+
+class RatioEvaluator:
+    """
+    Chamber accuracies as a function of R = L/s only
+
+    Results are cached by R in a bounded LRU, so repeated visits to the
+    same L/s line (from any (L, s) pair on it) cost a dictionary lookup.
+
+    relative_tolerance (peak-position error as a fraction of the chamber
+    length) replaces the fixed num_points with auto_num_points per R.
+
+    disk_cache (a DiskCache) backs the in-memory LRU with the persistent
+    peak/accuracy store, so reruns and other processes share results.
+    """
+
+    def __init__(self, wavelengths_base, targets, num_points=DEFAULT_NUM_POINTS,
+                 dtype=np.float64, prominence=DEFAULT_PROMINENCE,
+                 sample_limit=DEFAULT_SAMPLE_LIMIT, window=DEFAULT_WINDOW,
+                 peak_method='sampled',
+                 points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH,
+                 interpolation=None, relative_tolerance=None,
+                 cache_size=DEFAULT_CACHE_SIZE, disk_cache=None):
+        self.wavelengths_base = np.asarray(wavelengths_base, dtype=np.float64)
+        self.targets = np.asarray(targets, dtype=np.float64)
+        self.chamber_kwargs = dict(num_points=num_points, dtype=dtype,
+                                   prominence=prominence,
+                                   sample_limit=sample_limit, window=window,
+                                   peak_method=peak_method,
+                                   points_per_wavelength=points_per_wavelength,
+                                   interpolation=interpolation)
+        self.relative_tolerance = relative_tolerance
+        self.cache = LRUCache(cache_size)
+        self.disk_cache = disk_cache
+
+    def chamber(self, R):
+        """Canonical (s = 1) chamber for the line L/s = R"""
+        kwargs = self.chamber_kwargs
+        if self.relative_tolerance is not None:
+            shortest = np.min(self.wavelengths_base[self.wavelengths_base > 0])
+            num_points = auto_num_points(R, shortest, self.relative_tolerance * R,
+                                         kwargs['interpolation'])
+            kwargs = dict(kwargs, num_points=num_points)
+        return ResonanceChamber(R, **kwargs)
+
+    def ratios(self, R):
+        """Peak-position ratios on the line L/s = R"""
+        return self.chamber(R).compute_ratios(self.wavelengths_base)
+
+    def evaluate(self, R):
+        """Uncached (in memory) accuracies at R, through the disk cache if set"""
+        if self.disk_cache is not None:
+            return cached_chamber_accuracies(self.disk_cache, self.chamber(R),
+                                             self.wavelengths_base, self.targets)
+        return compute_accuracies(self.ratios(R), self.targets)
+
+    def accuracies(self, R):
+        """Per-target percent accuracy at R (cached)"""
+        return self.cache.get_or_compute(ratio_key(R), lambda: self.evaluate(R))
+
+    def accuracies_at(self, L, s):
+        """Per-target percent accuracy at (L, s), via R = L/s"""
+        return self.accuracies(L / s)
+
+    def __call__(self, R):
+        return self.accuracies(R)
@@ -0,0 +1,318 @@
+"""
+Precomputed Accuracy Landscape
+
+Every accuracy depends only on R = L/s (see invariant.py), so the whole
+(L, s) domain of a search is one line of R values. This module samples the
+per-target accuracy on a uniform R grid once and stores it as a directory
+of .npy tiles that are memory-mapped on lookup:
+
+    landscape.json      grid, wavelengths, targets, chamber settings
+    tile_00000.npy      (tile_points x targets) float64 accuracies
+    tile_00001.npy      ...
+
+    cd Chaos-Saturation/Code
+    python -m chamber.landscape build landscape/ --L-bounds 500 5000 --s-bounds 0.05 0.5 --step 0.01
+    python -m chamber.landscape info landscape/
+    python -m chamber.landscape query landscape/ 8866.9 --exact
+
+Tiles are written atomically and skipped when present, so an interrupted
+build resumes where it stopped. Lookups are nearest-sample or linear
+between samples; peaks jump discontinuously with R, so between samples
+the landscape is only an estimate. Use it to rank candidates and
+Landscape.exact() (a RatioEvaluator with the stored settings) for the
+final refinement.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from .batch import iter_batch_accuracies
+from .constants import CONSTANTS
+from .core import (
+    DEFAULT_NUM_POINTS,
+    DEFAULT_POINTS_PER_WAVELENGTH,
+    DEFAULT_PROMINENCE,
+    DEFAULT_SAMPLE_LIMIT,
+    DEFAULT_WINDOW,
+)
+from .invariant import RatioEvaluator, ratio_bounds
+
+META_FILE = 'landscape.json'
+DEFAULT_TILE_POINTS = 65536       # R samples per tile (5 MB at 10 targets)
+LANDSCAPE_FORMAT = 1
+LOOKUP_METHODS = ('nearest', 'linear')
+CANDIDATE_OVERSAMPLE = 8          # Per-tile shortlist = k * this, before spacing
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def tile_name(index):
+    return f'tile_{index:05d}.npy'
+
+
+def landscape_meta(wavelengths_base, targets, target_names, R_min, step, n_points,
+                   tile_points, chamber_kwargs):
+    """Everything that determines the stored values (compared on resume)"""
+    kwargs = dict(chamber_kwargs)
+    kwargs['dtype'] = np.dtype(kwargs.get('dtype', np.float64)).name
+    return {
+        'format': LANDSCAPE_FORMAT,
+        'wavelengths': [float(w) for w in wavelengths_base],
+        'targets': [float(t) for t in targets],
+        'target_names': list(target_names),
+        'R_min': float(R_min),
+        'step': float(step),
+        'n_points': int(n_points),
+        'tile_points': int(tile_points),
+        'chamber': kwargs,
+    }
+
+
+def build_landscape(path, wavelengths_base, targets, R_min, R_max, step,
+                    target_names=None, tile_points=DEFAULT_TILE_POINTS,
+                    verbose=True, **chamber_kwargs):
+    """
+    Sample accuracies at R_min, R_min + step, ... up to R_max into tiles at path
+
+    chamber_kwargs are passed to iter_batch_accuracies (num_points, dtype,
+    prominence, sample_limit, window, peak_method, points_per_wavelength,
+    interpolation). Returns the opened Landscape.
+    """
+    targets = np.asarray(targets, dtype=np.float64)
+    if target_names is None:
+        target_names = [f'target_{i}' for i in range(len(targets))]
+    n_points = int(np.floor((R_max - R_min) / step + 1e-9)) + 1
+    meta = landscape_meta(wavelengths_base, targets, target_names, R_min, step,
+                          n_points, tile_points, chamber_kwargs)
+
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, META_FILE)
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            existing = json.load(f)
+        if existing != meta:
+            raise ValueError(f"{path} holds a landscape with different settings; "
+                             f"use a new directory")
+    else:
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    n_tiles = -(-n_points // tile_points)
+    start_time = time.time()
+    for tile in range(n_tiles):
+        tile_path = os.path.join(path, tile_name(tile))
+        if os.path.exists(tile_path):
+            continue
+        first = tile * tile_points
+        R = R_min + step * np.arange(first, min(n_points, first + tile_points))
+        values = np.empty((len(R), len(targets)))
+        for start, accuracies in iter_batch_accuracies(wavelengths_base, targets, R=R,
+                                                       **chamber_kwargs):
+            values[start:start + len(accuracies)] = accuracies
+
+        # Write then rename, so a crash never leaves a partial tile behind
+        with open(tile_path + '.tmp', 'wb') as f:
+            np.save(f, values)
+        os.replace(tile_path + '.tmp', tile_path)
+        if verbose:
+            print(f"  Tile {tile + 1}/{n_tiles}: R [{R[0]:.4f}, {R[-1]:.4f}] "
+                  f"({time.time() - start_time:.0f}s)")
+
+    return Landscape(path)
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class Landscape:
+    """Memory-mapped view of a built landscape directory"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.R_min = self.meta['R_min']
+        self.step = self.meta['step']
+        self.n_points = self.meta['n_points']
+        self.R_max = self.R_min + self.step * (self.n_points - 1)
+        self.tile_points = self.meta['tile_points']
+        self.targets = np.array(self.meta['targets'])
+        self.target_names = self.meta['target_names']
+        self.tiles = {}
+        self._evaluator = None
+
+    def __len__(self):
+        return self.n_points
+
+    def tile(self, index):
+        """Tile array, memory-mapped on first use"""
+        if index not in self.tiles:
+            tile_path = os.path.join(self.path, tile_name(index))
+            if not os.path.exists(tile_path):
+                raise FileNotFoundError(f"{tile_path} is missing; finish the build first")
+            self.tiles[index] = np.load(tile_path, mmap_mode='r')
+        return self.tiles[index]
+
+    def rows(self, indices):
+        """Stored accuracy rows for sample indices, shaped (len(indices), targets)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        out = np.empty((len(indices), len(self.targets)))
+        tiles = indices // self.tile_points
+        for tile in np.unique(tiles):
+            mask = tiles == tile
+            out[mask] = self.tile(int(tile))[indices[mask] % self.tile_points]
+        return out
+
+    def grid(self, indices):
+        """R of sample indices"""
+        return self.R_min + self.step * np.asarray(indices)
+
+    def lookup(self, R, method='linear'):
+        """
+        Per-target accuracy at each R, from the stored samples
+
+        'nearest' returns the closest sample; 'linear' blends the two
+        samples around R. Raises ValueError outside [R_min, R_max].
+        """
+        if method not in LOOKUP_METHODS:
+            raise ValueError(f"method must be one of {LOOKUP_METHODS}, got {method!r}")
+        R = np.atleast_1d(np.asarray(R, dtype=np.float64))
+        if np.any(R < self.R_min) or np.any(R > self.R_max):
+            raise ValueError(f"R outside the landscape [{self.R_min}, {self.R_max}]")
+
+        position = (R - self.R_min) / self.step
+        if method == 'nearest':
+            return self.rows(np.rint(position).astype(np.int64))
+
+        lower = np.minimum(np.floor(position).astype(np.int64), self.n_points - 1)
+        upper = np.minimum(lower + 1, self.n_points - 1)
+        weight = (position - lower)[:, None]
+        return (1 - weight) * self.rows(lower) + weight * self.rows(upper)
+
+    def accuracies(self, R, method='linear'):
+        """Per-target accuracy at a single R"""
+        return self.lookup([R], method)[0]
+
+    def accuracies_at(self, L, s, method='linear'):
+        """Per-target accuracy at (L, s), via R = L/s"""
+        return self.accuracies(L / s, method)
+
+    def candidates(self, k=10, R_bounds=None, separation=None):
+        """
+        Up to k sample R values with the highest min accuracy, best first
+
+        Picks are at least separation apart in R (default: 10 steps), so
+        one broad optimum does not fill the whole list.
+        """
+        if separation is None:
+            separation = 10 * self.step
+        lo, hi = 0, self.n_points - 1
+        if R_bounds is not None:
+            lo = max(lo, int(np.ceil((R_bounds[0] - self.R_min) / self.step)))
+            hi = min(hi, int(np.floor((R_bounds[1] - self.R_min) / self.step)))
+
+        shortlist = []
+        for tile in range(lo // self.tile_points, hi // self.tile_points + 1):
+            first = tile * self.tile_points
+            start, stop = max(lo, first), min(hi + 1, first + self.tile_points)
+            if start >= stop:
+                continue
+            mins = np.min(self.tile(tile)[start - first:stop - first], axis=1)
+            keep = min(len(mins), k * CANDIDATE_OVERSAMPLE)
+            top = np.argpartition(-mins, keep - 1)[:keep]
+            shortlist.extend(zip(mins[top].tolist(), (start + top).tolist()))
+
+        picks = []
+        for min_acc, index in sorted(shortlist, key=lambda item: (-item[0], item[1])):
+            R = float(self.grid(index))
+            if all(abs(R - other) >= separation for other, _ in picks):
+                picks.append((R, min_acc))
+                if len(picks) == k:
+                    break
+        return picks
+
+    def evaluator(self, **overrides):
+        """RatioEvaluator with the settings the landscape was built with"""
+        kwargs = dict(self.meta['chamber'], **overrides)
+        kwargs['dtype'] = np.dtype(kwargs.get('dtype', 'float64'))
+        return RatioEvaluator(self.meta['wavelengths'], self.targets, **kwargs)
+
+    def exact(self, R):
+        """Exact (re-synthesized) per-target accuracy at R"""
+        if self._evaluator is None:
+            self._evaluator = self.evaluator()
+        return self._evaluator.accuracies(R)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Precomputed accuracy landscape over R = L/s')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Sample the landscape into tiles')
+    build.add_argument('path')
+    build.add_argument('--R-bounds', type=float, nargs=2, default=None)
+    build.add_argument('--L-bounds', type=float, nargs=2, default=(500, 5000))
+    build.add_argument('--s-bounds', type=float, nargs=2, default=(0.05, 0.5))
+    build.add_argument('--step', type=float, default=0.01, help='R spacing of the samples')
+    build.add_argument('--wavelengths', type=float, nargs='+', default=list(range(1, 31)))
+    build.add_argument('--num-points', type=int, default=DEFAULT_NUM_POINTS)
+    build.add_argument('--prominence', type=float, default=DEFAULT_PROMINENCE)
+    build.add_argument('--sample-limit', type=int, default=DEFAULT_SAMPLE_LIMIT)
+    build.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    build.add_argument('--analytic-peaks', action='store_true')
+    build.add_argument('--tile-points', type=int, default=DEFAULT_TILE_POINTS)
+
+    info = commands.add_parser('info', help='Show a landscape and its best candidates')
+    info.add_argument('path')
+    info.add_argument('--top', type=int, default=10)
+
+    query = commands.add_parser('query', help='Look up accuracies at R values')
+    query.add_argument('path')
+    query.add_argument('R', type=float, nargs='+')
+    query.add_argument('--method', choices=LOOKUP_METHODS, default='linear')
+    query.add_argument('--exact', action='store_true', help='Also re-evaluate exactly')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        R_min, R_max = args.R_bounds or ratio_bounds(args.L_bounds, args.s_bounds)
+        kwargs = dict(num_points=args.num_points, prominence=args.prominence,
+                      sample_limit=args.sample_limit, window=args.window,
+                      peak_method='analytic' if args.analytic_peaks else 'sampled',
+                      points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH)
+        print(f"Building landscape R [{R_min:.4f}, {R_max:.4f}], step {args.step}")
+        landscape = build_landscape(args.path, args.wavelengths, list(CONSTANTS.values()),
+                                    R_min, R_max, args.step,
+                                    target_names=list(CONSTANTS.keys()),
+                                    tile_points=args.tile_points, **kwargs)
+        print(f"Done: {len(landscape)} samples in {args.path}")
+
+    elif args.command == 'info':
+        landscape = Landscape(args.path)
+        print(f"R [{landscape.R_min:.4f}, {landscape.R_max:.4f}], step {landscape.step}, "
+              f"{len(landscape)} samples, {len(landscape.targets)} targets")
+        print(f"Chamber: {landscape.meta['chamber']}")
+        for R, min_acc in landscape.candidates(args.top):
+            print(f"  R={R:.4f}: min={min_acc:.4f}%")
+
+    else:
+        landscape = Landscape(args.path)
+        for R in args.R:
+            values = landscape.accuracies(R, args.method)
+            print(f"R={R:.4f}: min={values.min():.4f}%, avg={values.mean():.4f}% ({args.method})")
+            if args.exact:
+                values = landscape.exact(R)
+                print(f"{'':>{len(f'R={R:.4f}')}}  min={values.min():.4f}%, "
+                      f"avg={values.mean():.4f}% (exact)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Sorted Ratio Index
+
+Nearest-ratio lookup for many targets at once. The ratio array is sorted
+once (in log space, so targets spanning 1..3000 are bracketed uniformly),
+then every target is located with a single searchsorted call and compared
+against its two neighbours.
+
+Cost per evaluation: O(R log R + T log R) instead of O(R x T), so the
+target catalog can grow to hundreds of constants without slowing the
+search down.
+"""
+
+import numpy as np
+
+
+class RatioIndex:
+    """Sorted index over one evaluation's peak ratios"""
+
+    def __init__(self, ratios):
+        self.ratios = np.sort(np.asarray(ratios, dtype=np.float64))
+        self.log_ratios = np.log(self.ratios)
+
+    def __len__(self):
+        return len(self.ratios)
+
+    def nearest(self, targets):
+        """
+        Closest ratio to every target by absolute difference
+
+        Returns (best_ratios, abs_errors), both shaped like targets.
+        With no ratios, best_ratios is NaN and abs_errors is inf.
+        """
+        targets = np.asarray(targets, dtype=np.float64)
+        if len(self.ratios) == 0:
+            return np.full(targets.shape, np.nan), np.full(targets.shape, np.inf)
+
+        pos = np.searchsorted(self.log_ratios, np.log(targets))
+        lower = self.ratios[np.clip(pos - 1, 0, len(self.ratios) - 1)]
+        upper = self.ratios[np.clip(pos, 0, len(self.ratios) - 1)]
+
+        lower_err = np.abs(targets - lower)
+        upper_err = np.abs(upper - targets)
+        use_upper = upper_err < lower_err
+
+        best = np.where(use_upper, upper, lower)
+        errors = np.where(use_upper, upper_err, lower_err)
+        return best, errors
+
+    def errors(self, targets):
+        """Absolute error of the closest ratio for every target"""
+        return self.nearest(targets)[1]
@@ -0,0 +1,186 @@
+"""
+Analytic Peak Finding
+
+The chamber field is an explicit sum of sines,
+
+    f(x)   =  sum_w sin(k_w x)
+    f'(x)  =  sum_w k_w cos(k_w x)
+    f''(x) = -sum_w k_w^2 sin(k_w x),     k_w = 2*pi / w
+
+so peaks of |f| do not have to be read off a dense sample grid. This
+module brackets the roots of f' on a coarse grid (a few points per
+shortest wavelength), refines each one with safeguarded Newton steps, and
+applies the usual prominence filter to the exact extremum sequence.
+
+Peak positions are exact to ~1e-12 of the chamber length, so accuracies
+are no longer limited by L / num_points.
+
+Note: the fixed grids in the scripts (8000-15000 points over thousands
+of shortest wavelengths) sample below one point per wavelength, so part
+of their peak set is aliasing. The analytic peak set is the exact one and
+therefore differs from the sampled set at those resolutions.
+"""
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from .instrument import timed
+
+# Coarse bracketing grid density. Only pairs of f' roots closer than this
+# can be missed, and those are shallow bumps far below the prominence cut.
+DEFAULT_POINTS_PER_WAVELENGTH = 3
+NEWTON_MAX_ITER = 50
+NEWTON_TOL = 1e-13     # Relative to chamber length
+
+# Upper bound on elements in one (points x wavelengths) block
+DERIVATIVE_BLOCK_ELEMENTS = 1 << 20
+
+# ============================================================================
+# FIELD AND DERIVATIVES
+# ============================================================================
+
+def wavenumbers(wavelengths):
+    """k = 2*pi / w for every positive wavelength"""
+    wl = np.asarray(wavelengths, dtype=np.float64)
+    return 2 * np.pi / wl[wl > 0]
+
+
+def field_terms(x, k, order=0, block_elements=DERIVATIVE_BLOCK_ELEMENTS):
+    """
+    order-th derivative of sum_w sin(k_w x) at every x
+
+    Computed as a (points x wavelengths) trig block times the k^order
+    weights, in blocks of at most block_elements entries.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    trig = np.sin if order % 2 == 0 else np.cos
+    sign = (1, 1, -1, -1)[order % 4]
+    weights = sign * k ** order
+
+    out = np.empty(len(x))
+    rows = max(1, block_elements // max(1, len(k)))
+    for start in range(0, len(x), rows):
+        phase = np.multiply.outer(x[start:start + rows], k)
+        out[start:start + rows] = trig(phase, out=phase) @ weights
+    return out
+
+# ============================================================================
+# BRACKET + NEWTON
+# ============================================================================
+
+def bracket_extrema(k, length, points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH):
+    """
+    Intervals [lo, hi] on a coarse grid where f' changes sign
+
+    Grid points sit at multiples of (shortest wavelength) / points_per_wavelength,
+    plus the chamber end, so the brackets below any x are the same for every
+    chamber length (see pruning.py).
+    """
+    step = 2 * np.pi / np.max(k) / points_per_wavelength
+    xc = np.append(np.arange(int(np.ceil(length / step))) * step, length)
+    d1 = field_terms(xc, k, order=1)
+
+    crossing = np.nonzero(np.signbit(d1[:-1]) != np.signbit(d1[1:]))[0]
+    return xc[crossing], xc[crossing + 1]
+
+
+def refine_extrema(lo, hi, k, length, max_iter=NEWTON_MAX_ITER, tol=NEWTON_TOL):
+    """
+    Roots of f' inside each bracket by safeguarded Newton
+
+    Newton steps that leave the current bracket fall back to bisection,
+    and every iterate shrinks the bracket, so each root converges.
+    """
+    lo = lo.copy()
+    hi = hi.copy()
+    d_lo = field_terms(lo, k, order=1)
+    d_hi = field_terms(hi, k, order=1)
+
+    # Start from the secant (linear f') estimate inside each bracket
+    x = lo - d_lo * (hi - lo) / (d_hi - d_lo)
+    x = np.where((x > lo) & (x < hi), x, 0.5 * (lo + hi))
+    active = np.ones(len(x), dtype=bool)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        xa = x[active]
+        d1 = field_terms(xa, k, order=1)
+        d2 = field_terms(xa, k, order=2)
+
+        # Shrink the bracket around the sign change
+        same = np.signbit(d1) == np.signbit(d_lo[active])
+        lo_a, hi_a = lo[active], hi[active]
+        lo_a = np.where(same, xa, lo_a)
+        hi_a = np.where(same, hi_a, xa)
+        d_lo[active] = np.where(same, d1, d_lo[active])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(d2 != 0, d1 / d2, np.inf)
+        x_new = xa - step
+        outside = ~((x_new >= lo_a) & (x_new <= hi_a))
+        x_new = np.where(outside, 0.5 * (lo_a + hi_a), x_new)
+
+        lo[active], hi[active] = lo_a, hi_a
+        x[active] = x_new
+        done = (np.abs(x_new - xa) <= tol * length) | (hi_a - lo_a <= tol * length)
+        active[np.flatnonzero(active)[done]] = False
+
+    return x
+
+# ============================================================================
+# PEAKS OF |f|
+# ============================================================================
+
+def analytic_extrema(wavelengths, length,
+                     points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH):
+    """Positions and values of every extremum of f on (0, length)"""
+    k = wavenumbers(wavelengths)
+    if len(k) == 0:
+        return np.empty(0), np.empty(0)
+
+    lo, hi = bracket_extrema(k, length, points_per_wavelength)
+    if len(lo) == 0:
+        return np.empty(0), np.empty(0)
+    xe = refine_extrema(lo, hi, k, length)
+    return xe, field_terms(xe, k, order=0)
+
+
+def extremum_peaks(xe, fe, length, end_value, prominence):
+    """
+    Peaks of |f| with the given prominence from its extremum sequence
+
+    The prominence filter runs on the sequence of |f| at every extremum of f,
+    with the zero crossings between opposite-sign extrema inserted. |f| is
+    monotone between consecutive entries, so prominences match the
+    continuous field. end_value is |f(length)|.
+    """
+    if len(xe) == 0:
+        return np.empty(0)
+
+    # Zero of f between consecutive extrema of opposite sign
+    sign_change = np.signbit(fe[:-1]) != np.signbit(fe[1:])
+    n = len(fe)
+    positions = np.zeros(n + sign_change.sum() + 2)
+    values = np.zeros_like(positions)
+    slot = np.arange(n) + 1 + np.concatenate([[0], np.cumsum(sign_change)])
+    positions[slot] = xe
+    values[slot] = np.abs(fe)
+    positions[0], positions[-1] = 0.0, length
+    values[-1] = end_value
+
+    peaks, _ = find_peaks(values, prominence=prominence)
+    return positions[peaks]
+
+
+@timed('peaks')
+def analytic_peak_positions(wavelengths, length, prominence,
+                            points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH):
+    """Exact positions of the peaks of |f| on (0, length) with the given prominence"""
+    k = wavenumbers(wavelengths)
+    if len(k) == 0:
+        return np.empty(0)
+
+    xe, fe = analytic_extrema(wavelengths, length, points_per_wavelength)
+    end_value = abs(field_terms(np.array([length]), k, order=0)[0])
+    return extremum_peaks(xe, fe, length, end_value, prominence)
@@ -0,0 +1,215 @@
+"""
+Branch-and-Bound over R = L/s
+
+In canonical coordinates (s = 1, chamber of size R, see invariant.py) the
+field f(x) = sum_w sin(2*pi x / w) does not depend on R at all: R only sets
+where the chamber ends. With exact (analytic) peaks this makes the peak
+set almost static in R:
+
+- A peak p of |f| that has a zero of f between it and the chamber end has
+  the same position, the same neighbours and the same prominence for
+  every R beyond that zero (the right-hand prominence base is 0 either way).
+- Only extrema past the last zero crossing before R can change status.
+
+For a cell [a, b] of R the peak list is therefore
+
+    fixed(a)  +  some subset of the extrema in (cut(a), b)
+
+where cut(a) is the last extremum before a zero crossing that lies before
+a. Thinning keeps every stride-th peak, so the sampled fixed part is
+fixed(a)[::stride], a prefix that does not depend on which tail extrema
+appear. Every ratio any R in the cell can produce is in
+
+    ratios of fixed[::stride]                  (each possible stride)
+  + tail extremum / last window-1 sampled fixed peaks
+  + tail extremum / tail extremum
+
+Accuracy can only go up when ratios are added, so matching the targets
+against this superset bounds every accuracy over the cell from above.
+Cells whose bound misses the threshold for any target are discarded
+without evaluation. Conversely, when only one stride is possible the
+ratios of fixed[::stride] are always present, which bounds accuracy from
+below and certifies whole plateaus without further splitting.
+
+The bound holds for the analytic peak set (peak_method='analytic'), whose
+bracketing grid is anchored at x = 0 so every chamber length sees the
+same extrema. Sampled peaks on a fixed grid jitter with R at the grid
+scale, so they admit no such bound.
+"""
+
+import numpy as np
+
+from .core import (
+    DEFAULT_POINTS_PER_WAVELENGTH,
+    DEFAULT_PROMINENCE,
+    DEFAULT_SAMPLE_LIMIT,
+    DEFAULT_WINDOW,
+    RATIO_MAX,
+    RATIO_MIN,
+    compute_accuracies,
+    peak_ratios,
+)
+from .matching import RatioIndex
+from .peaks import analytic_extrema, extremum_peaks, field_terms, wavenumbers
+
+DEFAULT_MIN_WIDTH = 1e-3        # Cells narrower than this (in R) are leaves
+MAX_TAIL_EXTREMA = 2048         # Wider tails are split without bounding
+
+# ============================================================================
+# EXTREMUM TABLE
+# ============================================================================
+
+class ExtremumTable:
+    """Every extremum and every prominent peak of |f| on (0, R_max), computed once"""
+
+    def __init__(self, wavelengths_base, R_max, prominence=DEFAULT_PROMINENCE,
+                 points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH):
+        k = wavenumbers(wavelengths_base)
+        self.R_max = R_max
+        self.extrema, values = analytic_extrema(wavelengths_base, R_max,
+                                                points_per_wavelength)
+        end_value = abs(field_terms(np.array([R_max]), k, order=0)[0]) if len(k) else 0.0
+        self.peaks = extremum_peaks(self.extrema, values, R_max, end_value, prominence)
+
+        # Extremum e_i is followed by a zero of f whenever f changes sign
+        # before e_{i+1}; keyed by the position of e_{i+1}
+        change = np.flatnonzero(np.signbit(values[:-1]) != np.signbit(values[1:]))
+        self.zero_before = self.extrema[change]
+        self.zero_after = self.extrema[change + 1]
+
+    def cut(self, R):
+        """Largest extremum position with a zero of f between it and R (-inf if none)"""
+        i = np.searchsorted(self.zero_after, R, side='right') - 1
+        return self.zero_before[i] if i >= 0 else -np.inf
+
+    def cell_parts(self, a, b):
+        """(fixed peaks, tail extrema) for the cell [a, b]"""
+        cut = self.cut(a)
+        fixed = self.peaks[:np.searchsorted(self.peaks, cut, side='right')]
+        tail = self.extrema[np.searchsorted(self.extrema, cut, side='right'):
+                            np.searchsorted(self.extrema, b, side='left')]
+        return fixed, tail
+
+# ============================================================================
+# CELL BOUNDS
+# ============================================================================
+
+def possible_strides(n_lo, n_hi, sample_limit=DEFAULT_SAMPLE_LIMIT):
+    """Distinct sample_peaks strides for peak counts n_lo..n_hi"""
+    n = np.arange(n_lo, n_hi + 1)
+    sample_size = np.maximum(1, np.minimum(sample_limit, n))
+    return np.unique(np.maximum(1, n // sample_size))
+
+
+def cell_ratio_superset(fixed, tail, sample_limit=DEFAULT_SAMPLE_LIMIT,
+                        window=DEFAULT_WINDOW):
+    """Every ratio a peak list fixed + (subset of tail) could produce"""
+    pieces = []
+    for stride in possible_strides(len(fixed), len(fixed) + len(tail), sample_limit):
+        sampled = fixed[::stride]
+        pieces.append(peak_ratios(sampled, window))
+        partners = sampled if window is None else sampled[-(window - 1):]
+        if len(partners) and len(tail):
+            pieces.append(np.divide.outer(tail, partners).ravel())
+
+    if len(tail) > 1:
+        i, j = np.triu_indices(len(tail), k=1)
+        pieces.append(tail[j] / tail[i])
+
+    if not pieces:
+        return np.empty(0)
+    ratios = np.concatenate(pieces)
+    return ratios[(ratios > RATIO_MIN) & (ratios < RATIO_MAX)]
+
+
+def cell_upper_bound(table, a, b, targets, sample_limit=DEFAULT_SAMPLE_LIMIT,
+                     window=DEFAULT_WINDOW):
+    """Per-target upper bound on percent accuracy over R in [a, b] (None if too wide)"""
+    fixed, tail = table.cell_parts(a, b)
+    if len(tail) > MAX_TAIL_EXTREMA:
+        return None
+    return compute_accuracies(RatioIndex(cell_ratio_superset(fixed, tail, sample_limit,
+                                                             window)), targets)
+
+
+def cell_lower_bound(table, a, b, targets, sample_limit=DEFAULT_SAMPLE_LIMIT,
+                     window=DEFAULT_WINDOW):
+    """
+    Per-target lower bound on percent accuracy over R in [a, b] (None if unknown)
+
+    With a single possible stride the ratios among fixed[::stride] are
+    present for every R in the cell, whatever the tail does.
+    """
+    fixed, tail = table.cell_parts(a, b)
+    strides = possible_strides(len(fixed), len(fixed) + len(tail), sample_limit)
+    if len(strides) != 1:
+        return None
+    return compute_accuracies(peak_ratios(fixed[::strides[0]], window), targets)
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def branch_and_bound(wavelengths_base, targets, R_bounds, threshold,
+                     prominence=DEFAULT_PROMINENCE, sample_limit=DEFAULT_SAMPLE_LIMIT,
+                     window=DEFAULT_WINDOW,
+                     points_per_wavelength=DEFAULT_POINTS_PER_WAVELENGTH,
+                     min_width=DEFAULT_MIN_WIDTH, table=None):
+    """
+    Cells of [R_min, R_max] that may reach threshold on every target
+
+    Cells are bisected depth-first. A cell is discarded as soon as its upper
+    bound for any target is below threshold, certified (kept whole) once its
+    lower bound reaches threshold on every target, and kept unresolved once
+    it is narrower than min_width. Returns a dict with 'survivors' (merged
+    (a, b, bound, certified) intervals, bound = min over targets of the
+    upper bound), 'cells' (bounded), 'pruned' and 'pruned_width' (total R
+    width proven to miss the threshold).
+    """
+    R_min, R_max = R_bounds
+    targets = np.asarray(targets, dtype=np.float64)
+    if table is None:
+        table = ExtremumTable(wavelengths_base, R_max, prominence, points_per_wavelength)
+
+    survivors = []
+    cells = pruned = 0
+    pruned_width = 0.0
+    stack = [(R_min, R_max)]
+
+    while stack:
+        a, b = stack.pop()
+        bound = cell_upper_bound(table, a, b, targets, sample_limit, window)
+        if bound is not None:
+            cells += 1
+            if np.min(bound) < threshold:
+                pruned += 1
+                pruned_width += b - a
+                continue
+            lower = cell_lower_bound(table, a, b, targets, sample_limit, window)
+            if lower is not None and np.min(lower) >= threshold:
+                survivors.append((a, b, float(np.min(bound)), True))
+                continue
+            if b - a <= min_width:
+                survivors.append((a, b, float(np.min(bound)), False))
+                continue
+        mid = 0.5 * (a + b)
+        stack.extend([(mid, b), (a, mid)])
+
+    return {'survivors': merge_cells(survivors), 'cells': cells, 'pruned': pruned,
+            'pruned_width': pruned_width}
+
+
+def merge_cells(cells):
+    """
+    Join touching (a, b, bound, certified) cells into intervals
+    (bound = max over the pieces, certified only if every piece is)
+    """
+    merged = []
+    for a, b, bound, certified in sorted(cells):
+        if merged and a <= merged[-1][1]:
+            last_a, last_b, last_bound, last_certified = merged[-1]
+            merged[-1] = (last_a, max(last_b, b), max(last_bound, bound),
+                          last_certified and certified)
+        else:
+            merged.append((a, b, bound, certified))
+    return merged
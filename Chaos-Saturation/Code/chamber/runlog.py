@@ -0,0 +1,121 @@
+"""
+Append-Only Run Log
+
+JSON Lines record of a long search: one {'event': ..., ...} object per
+line. Each record goes out in a single os.write on an O_APPEND descriptor,
+so records from every worker of a pool interleave whole, and a crash
+loses at most the line being written. Readers skip a torn last line.
+
+Like DiskCache, each process opens its own descriptor lazily, so RunLog
+objects can be pickled into pool initializers.
+
+Appends reach the OS at once, so a killed process loses nothing; with
+fsync_every=N they are also flushed to disk every N records, bounding what
+a power loss can take. compact() atomically rewrites the log to a given
+list of records (e.g. one per key, torn lines dropped).
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+def json_default(value):
+    """json.dumps fallback for numpy scalars and arrays"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_record(event, **fields):
+    """One log line (with trailing newline) for event and fields"""
+    return json.dumps({'event': event, **fields}, default=json_default,
+                      separators=(',', ':')) + '\n'
+
+
+def read_records(path):
+    """Yield the records of a log file in order, skipping unreadable lines"""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue   # torn write from a crash
+            if isinstance(record, dict) and 'event' in record:
+                yield record
+
+
+class RunLog:
+    """Append-only JSON Lines file shared by a process and its pool workers"""
+
+    def __init__(self, path, fsync_every=None):
+        self.path = os.path.abspath(path)
+        self.fsync_every = fsync_every
+        self._fd = None
+        self._pid = None
+        self._unsynced = 0
+
+    def __getstate__(self):
+        # Descriptors cannot cross processes; workers reopen on first append
+        state = dict(self.__dict__)
+        state['_fd'] = None
+        state['_pid'] = None
+        state['_unsynced'] = 0
+        return state
+
+    @property
+    def fd(self):
+        if self._fd is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+            self._unsynced = 0
+            # End a torn last line so the next record starts on its own line
+            size = os.fstat(self._fd).st_size
+            if size and os.pread(self._fd, 1, size - 1) != b'\n':
+                os.write(self._fd, b'\n')
+        return self._fd
+
+    def append(self, event, **fields):
+        os.write(self.fd, encode_record(event, **fields).encode())
+        self._unsynced += 1
+        if self.fsync_every is not None and self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        """Flush appended records to disk"""
+        if self._fd is not None and self._pid == os.getpid() and self._unsynced:
+            os.fsync(self._fd)
+        self._unsynced = 0
+
+    def records(self):
+        return read_records(self.path)
+
+    def truncate(self):
+        """Start the log over (a new, non-resumed run)"""
+        self.close()
+        open(self.path, 'w').close()
+
+    def compact(self, records):
+        """Atomically replace the log with records (dicts with an 'event' key)"""
+        self.close()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(encode_record(**record))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        if self._fd is not None and self._pid == os.getpid():
+            self.sync()
+            os.close(self._fd)
+        self._fd = None
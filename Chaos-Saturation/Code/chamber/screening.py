@@ -0,0 +1,73 @@
+"""
+Threshold Screening
+
+Most points a local search visits only matter if their minimum accuracy
+beats the best so far. Screening matches the constants one at a time,
+historically worst first, and stops at the first one that falls below the
+threshold, so a rejected point usually costs one nearest-ratio scan
+instead of sorting its ratios and matching every constant.
+
+A point that passes has every constant matched, so its accuracy vector is
+exactly what compute_accuracies returns.
+"""
+
+import numpy as np
+
+from .instrument import timed
+
+
+class WorstFirstOrder:
+    """Target order by how often each target was the worst (most often first)"""
+
+    def __init__(self, n_targets):
+        self.counts = np.zeros(n_targets, dtype=np.int64)
+
+    def order(self):
+        # Stable, so ties keep catalog order
+        return np.argsort(-self.counts, kind='stable')
+
+    def record(self, index):
+        """Count target index as the worst of one evaluation"""
+        self.counts[index] += 1
+
+    def record_accuracies(self, accuracies):
+        """Count the worst target of a full accuracy vector"""
+        self.record(int(np.argmin(accuracies)))
+
+
+@timed('matching')
+def screen_accuracies(ratios, targets, threshold, order=None):
+    """
+    Per-target percent accuracy, abandoned at the first target below threshold
+
+    Targets are matched in order (a WorstFirstOrder, an index sequence, or
+    catalog order when None). Returns (accuracies, failed): unmatched
+    entries are NaN and failed is the index of the rejecting target, or
+    None when every target reached threshold. A WorstFirstOrder is updated
+    with the rejecting (or, on a pass, the worst) target.
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    tracker = order if isinstance(order, WorstFirstOrder) else None
+    if tracker is not None:
+        indices = tracker.order()
+    elif order is None:
+        indices = range(len(targets))
+    else:
+        indices = order
+
+    accuracies = np.full(len(targets), np.nan)
+    for index in indices:
+        target = targets[index]
+        if len(ratios):
+            accuracies[index] = 100 * (1 - np.min(np.abs(ratios - target)) / target)
+        else:
+            accuracies[index] = 0.0
+        if accuracies[index] < threshold:
+            if tracker is not None:
+                tracker.record(index)
+            return accuracies, int(index)
+
+    if tracker is not None:
+        tracker.record_accuracies(accuracies)
+    return accuracies, None
@@ -18,19 +18,25 @@ from scipy.fft import fft, fftfreq
 import matplotlib.pyplot as plt
 import json
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from chamber import ResonanceChamber as SharedChamber
+from chamber.constants import CONSTANTS as SHARED_CONSTANTS
 
 # ============================================================================
 # RESONANCE CHAMBER - EXTENDED WITH TOPOLOGY
 # ============================================================================
 
-class ResonanceChamber:
+class ResonanceChamber(SharedChamber):
     """1D resonance chamber with optional topological features"""
     
     def __init__(self, chamber_size, topology='simple', num_points=15000):
-        self.chamber_size = chamber_size
+        # All peak pairs, up to 200 sampled peaks
+        super().__init__(chamber_size, num_points=num_points,
+                         sample_limit=200, window=None)
         self.topology = topology
-        self.num_points = num_points
-        self.x = np.linspace(0, chamber_size, num_points)
         
         # Generate boundary geometry based on topology
         self.boundary_modulation = self._create_topology()
@@ -96,39 +102,7 @@ class ResonanceChamber:
     
     def compute_interference(self, wavelengths):
         """Standard multi-wavelength interference"""
-        total_field = np.zeros(len(self.x))
-        for wl in wavelengths:
-            if wl > 0:
-                total_field += self.generate_wave(wl)
-        return total_field
-    
-    def extract_ratios(self, field):
-        """Extract peak position ratios from field"""
-        peaks, _ = find_peaks(np.abs(field), prominence=0.5)
-        
-        if len(peaks) < 2:
-            return []
-        
-        peak_positions = self.x[peaks]
-        ratios = []
-        sample_size = min(200, len(peak_positions))
-        sampled_peaks = peak_positions[::max(1, len(peak_positions)//sample_size)]
-        
-        for i in range(len(sampled_peaks)):
-            for j in range(i+1, len(sampled_peaks)):
-                ratio = sampled_peaks[j] / sampled_peaks[i]
-                if 1.01 < ratio < 3000:
-                    ratios.append(ratio)
-        return ratios
-    
-    def find_best_match(self, ratios, target):
-        """Find best ratio match to target constant"""
-        if not ratios:
-            return None, float('inf')
-        differences = [abs(r - target) for r in ratios]
-        min_diff = min(differences)
-        best_ratio = ratios[differences.index(min_diff)]
-        return best_ratio, min_diff
+        return super().compute_interference(wavelengths) * self.boundary_modulation
     
     def analyze_frequency_content(self, field):
         """
@@ -150,27 +124,16 @@ class ResonanceChamber:
         
         return freqs, power, freq_peaks
 
-# Target constants
-CONSTANTS = {
-    'fine_structure': 137.035999084,
-    'phi': 1.618033988749895,
-    'pi': 3.141592653589793,
-    'e': 2.718281828459045,
-    'proton_electron_mass': 1836.15267343,
-}
+# Target constants: the five this experiment was designed around, taken
+# from the shared table so their values cannot drift
+TARGET_NAMES = ('fine_structure', 'phi', 'pi', 'e', 'proton_electron_mass')
+CONSTANTS = {name: SHARED_CONSTANTS[name] for name in TARGET_NAMES}
 
 def test_configuration(field, chamber, name):
     """Test a field configuration"""
     ratios = chamber.extract_ratios(field)
     
-    accuracies = []
-    for target in CONSTANTS.values():
-        match, error = chamber.find_best_match(ratios, target)
-        if match is not None:
-            acc = 100 * (1 - error / target)
-            accuracies.append(acc)
-        else:
-            accuracies.append(0.0)
+    accuracies = chamber.compute_accuracies(ratios, list(CONSTANTS.values())).tolist()
     
     avg_acc = np.mean(accuracies)
     above_99 = sum(1 for a in accuracies if a >= 99.0)